@@ -47,17 +47,18 @@ async def chat_websocket(websocket: WebSocket):
             gemini_messages.append({"role": "user", "parts": [{"text": user_text}]})
 
             # Run agent with tool use
-            full_response = ""
+            response_parts: list[str] = []
             try:
                 async for token in agent.run(gemini_messages):
                     await websocket.send_text(token)
-                    full_response += token
+                    response_parts.append(token)
             except Exception as e:
                 logger.error(f"Agent error in conversation {conversation_id}: {e}", exc_info=True)
                 await websocket.send_json({"type": "error", "message": str(e)})
                 continue
 
             # Save assistant message
+            full_response = "".join(response_parts)
             _save_message(conversation_id, "assistant", full_response)
             gemini_messages.append({"role": "model", "parts": [{"text": full_response}]})
 
@@ -1,7 +1,8 @@
 """Integration status and data endpoints for Google and GitHub."""
 
-import json
+import asyncio
 import logging
+import re
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -10,34 +11,19 @@ from fastapi import APIRouter, File, Form, Query, UploadFile
 from pydantic import BaseModel
 
 from app.core.config import settings
-from app.services.integrations.github import GitHubService
+from app.services.integrations.github import (
+    get_github,
+    load_project_sources,
+    save_project_sources,
+)
 from app.services.integrations.google import GoogleCalendarService
-from app.services.integrations.wordpress import WordPressService
+from app.services.integrations.wordpress import get_wordpress
 from app.services.tools.google_tools import get_google_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# --- Project sources persistence ---
-
-_SOURCES_FILE = settings.data_dir / "github_project_sources.json"
-
-
-def _load_project_sources() -> list[str]:
-    if _SOURCES_FILE.exists():
-        try:
-            return json.loads(_SOURCES_FILE.read_text())
-        except Exception:
-            pass
-    return []
-
-
-def _save_project_sources(sources: list[str]) -> None:
-    settings.data_dir.mkdir(parents=True, exist_ok=True)
-    _SOURCES_FILE.write_text(json.dumps(sources))
-
-
 # --- Status ---
 
 
@@ -86,7 +72,7 @@ async def _check_github() -> dict:
 
 async def _check_wordpress() -> dict:
     """Check WordPress: configured (settings set) and connected (XML-RPC auth works)."""
-    wp = WordPressService()
+    wp = get_wordpress()
     if not wp.is_configured:
         return {"configured": False, "connected": False}
 
@@ -168,7 +154,7 @@ async def calendar_events(
 @router.get("/github/project-sources")
 async def get_project_sources():
     """Get the list of GitHub usernames/orgs to search for projects."""
-    return {"sources": _load_project_sources()}
+    return {"sources": load_project_sources()}
 
 
 class AddSourceRequest(BaseModel):
@@ -182,19 +168,19 @@ async def add_project_source(req: AddSourceRequest):
     if not owner:
         return {"error": "Owner cannot be empty"}
 
-    sources = _load_project_sources()
+    sources = load_project_sources()
     if owner.lower() not in [s.lower() for s in sources]:
         sources.append(owner)
-        _save_project_sources(sources)
+        save_project_sources(sources)
     return {"sources": sources}
 
 
 @router.delete("/github/project-sources/{owner}")
 async def remove_project_source(owner: str):
     """Remove a GitHub username/org from project sources."""
-    sources = _load_project_sources()
+    sources = load_project_sources()
     sources = [s for s in sources if s.lower() != owner.lower()]
-    _save_project_sources(sources)
+    save_project_sources(sources)
     return {"sources": sources}
 
 
@@ -205,8 +191,8 @@ async def github_projects():
         return {"configured": False, "projects": []}
 
     try:
-        sources = _load_project_sources()
-        github = GitHubService()
+        sources = load_project_sources()
+        github = get_github()
         projects = await github.list_accessible_projects(extra_owners=sources)
         results = [
             {
@@ -233,7 +219,7 @@ async def github_project_items(project_id: str):
         return {"configured": False, "columns": []}
 
     try:
-        github = GitHubService()
+        github = get_github()
         items = await github.list_project_items(project_id)
 
         # Group items by their Status field
@@ -250,13 +236,7 @@ async def github_project_items(project_id: str):
                 "url": content.get("url", ""),
             }
 
-            # Extract status field value
-            status = ""
-            for fv in item.get("fieldValues", {}).get("nodes", []):
-                field = fv.get("field", {})
-                if field.get("name") == "Status":
-                    status = fv.get("name", "")
-                    break
+            status = (item.get("status") or {}).get("name", "")
 
             if status:
                 columns.setdefault(status, []).append(parsed)
@@ -284,7 +264,7 @@ async def github_issue_detail(owner: str, repo: str, number: int):
         return {"configured": False}
 
     try:
-        github = GitHubService()
+        github = get_github()
         issue = await github.get_issue(owner, repo, number)
         comments = [
             {
@@ -317,9 +297,15 @@ async def github_issue_detail(owner: str, repo: str, number: int):
 
 # --- WordPress ---
 
+# Comments first (they may contain ">"), then tags. A tag can't contain "<",
+# so a stray unclosed "<" costs one scan to the next "<", not to the end.
+_TAG_RE = re.compile(r"<!--.*?-->|<[^<>]+>", re.DOTALL)
+
+
 def _strip_html(html: str) -> str:
-    import re
-    return re.sub(r"<[^>]+>", "", html).strip()
+    if "<" not in html:
+        return html.strip()
+    return _TAG_RE.sub("", html).strip()
 
 
 def _format_wp_post(p: dict) -> dict:
@@ -339,7 +325,7 @@ def _format_wp_post(p: dict) -> dict:
 
 @router.get("/wordpress/categories")
 async def wordpress_categories():
-    wp = WordPressService()
+    wp = get_wordpress()
     if not wp.is_configured:
         return {"configured": False, "categories": []}
 
@@ -363,7 +349,7 @@ async def wordpress_posts(
     status: str = Query(default="any", description="Post status filter"),
     per_page: int = Query(default=10, description="Number of posts"),
 ):
-    wp = WordPressService()
+    wp = get_wordpress()
     if not wp.is_configured:
         return {"configured": False, "posts": []}
 
@@ -380,7 +366,7 @@ async def wordpress_posts(
 
 @router.get("/wordpress/posts/{post_id}")
 async def wordpress_post_detail(post_id: int):
-    wp = WordPressService()
+    wp = get_wordpress()
     if not wp.is_configured:
         return {"configured": False}
 
@@ -406,7 +392,7 @@ class CreatePostRequest(BaseModel):
 
 @router.post("/wordpress/posts")
 async def wordpress_create_post(req: CreatePostRequest):
-    wp = WordPressService()
+    wp = get_wordpress()
     if not wp.is_configured:
         return {"configured": False}
 
@@ -448,7 +434,7 @@ class UpdatePostRequest(BaseModel):
 
 @router.put("/wordpress/posts/{post_id}")
 async def wordpress_update_post(post_id: int, req: UpdatePostRequest):
-    wp = WordPressService()
+    wp = get_wordpress()
     if not wp.is_configured:
         return {"configured": False}
 
@@ -480,7 +466,7 @@ async def wordpress_update_post(post_id: int, req: UpdatePostRequest):
 
 @router.delete("/wordpress/posts/{post_id}")
 async def wordpress_delete_post(post_id: int):
-    wp = WordPressService()
+    wp = get_wordpress()
     if not wp.is_configured:
         return {"configured": False}
 
@@ -495,7 +481,7 @@ async def wordpress_delete_post(post_id: int):
 @router.get("/wordpress/media/check")
 async def wordpress_media_check():
     """Diagnostic: test XML-RPC auth and upload capability."""
-    wp = WordPressService()
+    wp = get_wordpress()
     if not wp.is_configured:
         return {"configured": False}
 
@@ -553,13 +539,13 @@ async def wordpress_upload_media(
     file: UploadFile = File(...),
     alt_text: str = Form(""),
 ):
-    wp = WordPressService()
+    wp = get_wordpress()
     if not wp.is_configured:
         return {"configured": False}
 
     try:
         raw = await file.read()
-        processed, filename = wp._process_image(raw)
+        processed, filename = await asyncio.to_thread(wp._process_image, raw)
         media = await wp.upload_media(
             filename=filename,
             data=processed,
@@ -8,6 +8,7 @@ from sqlmodel import Session, select
 
 from app.core.database import get_session
 from app.models.schedule import ScheduledAction, ScheduledRun
+from app.services.scheduler.scheduler import invalidate_actions_cache
 
 router = APIRouter()
 
@@ -76,6 +77,7 @@ async def create_schedule(body: ScheduleCreate, session: Session = Depends(get_s
     session.add(action)
     session.commit()
     session.refresh(action)
+    invalidate_actions_cache()
     return {"id": action.id, "status": "created"}
 
 
@@ -99,6 +101,7 @@ async def update_schedule(
     action.updated_at = datetime.now(timezone.utc)
     session.add(action)
     session.commit()
+    invalidate_actions_cache()
     return {"id": action.id, "status": "updated"}
 
 
@@ -117,6 +120,7 @@ async def delete_schedule(schedule_id: int, session: Session = Depends(get_sessi
 
     session.delete(action)
     session.commit()
+    invalidate_actions_cache()
     return {"status": "deleted"}
 
 
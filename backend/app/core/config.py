@@ -15,12 +15,16 @@ class Settings(BaseSettings):
     llm_provider: str = "gemini"  # gemini | openai | local
     gemini_api_key: str = ""
 
+    # STT
+    whisper_compute_type: str = "int8"  # faster-whisper weight type; int8 is fastest on CPU
+
     # TTS
     tts_provider: str = "elevenlabs"  # elevenlabs | local
     elevenlabs_api_key: str = ""
 
     # Google
     google_credentials_path: str = ""
+    google_max_concurrency: int = 24  # ceiling for concurrent Google API requests
 
     # GitHub
     github_token: str = ""
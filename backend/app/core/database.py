@@ -12,6 +12,10 @@ engine = create_engine(
 def init_db() -> None:
     import app.models  # noqa: F401 - ensure models are registered
     SQLModel.metadata.create_all(engine)
+    # create_all skips indexes on tables that already exist
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
 
 
 def get_session():
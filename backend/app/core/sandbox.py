@@ -1,5 +1,6 @@
 """Sandboxed file access - ensures all file operations stay within the data directory."""
 
+import functools
 from pathlib import Path
 
 from app.core.config import settings
@@ -9,9 +10,21 @@ class SandboxError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=4)
+def _sandbox_root(data_dir: Path) -> Path:
+    # Keyed on the configured dir, so a changed setting resolves afresh
+    return data_dir.resolve()
+
+
 def resolve_sandboxed_path(relative_path: str) -> Path:
-    """Resolve a relative path within the sandbox. Raises SandboxError if path escapes."""
-    data_dir = settings.data_dir.resolve()
+    """Resolve a relative path within the sandbox. Raises SandboxError if path escapes.
+
+    Only the sandbox root is cached; the target is resolved on every call so
+    symlinks created later are still caught.
+    """
+    data_dir = _sandbox_root(settings.data_dir)
+    if not relative_path:
+        return data_dir
     resolved = (data_dir / relative_path).resolve()
 
     if not resolved.is_relative_to(data_dir):
@@ -22,6 +35,6 @@ def resolve_sandboxed_path(relative_path: str) -> Path:
 
 def validate_sandbox_path(absolute_path: Path) -> None:
     """Validate that an absolute path is within the sandbox."""
-    data_dir = settings.data_dir.resolve()
+    data_dir = _sandbox_root(settings.data_dir)
     if not absolute_path.resolve().is_relative_to(data_dir):
         raise SandboxError(f"Path '{absolute_path}' is outside the sandbox")
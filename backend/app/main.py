@@ -8,7 +8,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.database import init_db
 from app.api import chat, claude_cli, conversations, files, google_auth, integrations, markets, notes, schedules, voice, workouts
+from app.services.integrations.github import GitHubService
+from app.services.integrations.markets import MarketsService
+from app.services.integrations.wordpress import WordPressService
 from app.services.scheduler.scheduler import scheduler_loop
+from app.services.tools import web_tools
+from app.services.voice import whisper_stt
+from app.services.voice.elevenlabs_tts import ElevenLabsTTSProvider
+from app.services.tools.google_tools import get_google_service
 
 
 @asynccontextmanager
@@ -23,18 +30,34 @@ async def lifespan(app: FastAPI):
     init_db()
     settings.data_dir.mkdir(parents=True, exist_ok=True)
 
+    # Load Google credentials now rather than on the first API request
+    await get_google_service().warm_up()
+
+    # Load the speech-to-text model in the background so startup isn't held up
+    stt_warmup = asyncio.create_task(whisper_stt.warm_up())
+
     # Start background scheduler
     scheduler_task = asyncio.create_task(scheduler_loop())
 
     yield
 
-    # Cancel scheduler on shutdown
+    # Cancel scheduler on shutdown. Cancelling the warm-up only drops its task;
+    # a model load already running in its worker thread finishes on its own.
+    stt_warmup.cancel()
     scheduler_task.cancel()
     try:
         await scheduler_task
     except asyncio.CancelledError:
         pass
 
+    # Close shared HTTP clients
+    await GitHubService.aclose()
+    await MarketsService.aclose()
+    await WordPressService.aclose()
+    await web_tools.aclose()
+    await ElevenLabsTTSProvider.aclose()
+    await get_google_service().aclose()
+
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
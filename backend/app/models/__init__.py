@@ -1,4 +1,5 @@
 from app.models.conversation import Conversation, ChatMessage
+from app.models.gmail import GmailMessage
 from app.models.schedule import ScheduledAction, ScheduledRun
 
-__all__ = ["Conversation", "ChatMessage", "ScheduledAction", "ScheduledRun"]
+__all__ = ["Conversation", "ChatMessage", "GmailMessage", "ScheduledAction", "ScheduledRun"]
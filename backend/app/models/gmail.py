@@ -0,0 +1,13 @@
+"""Short-lived local copy of Gmail messages recently read in full."""
+
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+class GmailMessage(SQLModel, table=True):
+    # Gmail message ID; headers and body never change once sent, but labels
+    # do and the message can be deleted, so rows expire (see google.py)
+    id: str = Field(primary_key=True)
+    payload: bytes  # full-format message resource as JSON
+    fetched_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
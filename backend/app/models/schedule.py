@@ -20,7 +20,9 @@ class ScheduledAction(SQLModel, table=True):
 class ScheduledRun(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     action_id: int = Field(foreign_key="scheduledaction.id")
-    started_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), index=True
+    )
     finished_at: Optional[datetime] = None
     status: str = Field(default="running")  # running | success | failed
     result: str = Field(default="")
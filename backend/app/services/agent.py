@@ -1,15 +1,16 @@
 """Agent orchestration - handles multi-step tool use with the LLM."""
 
 import asyncio
-import json
 import logging
 from pathlib import Path
 from typing import AsyncIterator
 
+import httpx
 from google import genai
 from google.genai import types
 
 from app.core.config import settings
+from app.services.integrations.github import load_project_sources
 from app.services.tools.registry import ToolRegistry, create_default_registry
 
 logger = logging.getLogger(__name__)
@@ -36,42 +37,30 @@ IMPORTANT RULES:
 - You can chain multiple tools together to accomplish complex tasks.
 - Always be concise and helpful. When you use a tool, briefly explain what you did."""
 
-_SOURCES_FILE = settings.data_dir / "github_project_sources.json"
-
 
 async def _build_system_prompt() -> str:
     """Build the system prompt with dynamic context about known projects."""
     prompt = SYSTEM_PROMPT_BASE
 
     # Load and resolve known projects so the LLM has direct access
-    sources: list[str] = []
-    if _SOURCES_FILE.exists():
-        try:
-            sources = json.loads(_SOURCES_FILE.read_text())
-        except Exception:
-            pass
+    sources = load_project_sources()
 
     if settings.github_token:
         try:
-            import httpx
-            from app.services.integrations.github import GitHubService
-            github = GitHubService()
+            from app.services.integrations.github import get_github
+            github = get_github()
 
             # Fetch the authenticated user's GitHub username
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(
-                    "https://api.github.com/user",
-                    headers=github._headers(),
-                    timeout=5.0,
+            try:
+                gh_username = (await github.get_authenticated_user()).get("login", "")
+            except httpx.HTTPError:
+                gh_username = ""
+            if gh_username:
+                prompt += f"\n\nThe user's GitHub username is: {gh_username}"
+                prompt += (
+                    f"\nWhen checking for issues assigned to the user, look for assignee \"{gh_username}\". "
+                    "Items in a project board that are assigned to this user are the user's tasks."
                 )
-                if resp.status_code == 200:
-                    gh_username = resp.json().get("login", "")
-                    if gh_username:
-                        prompt += f"\n\nThe user's GitHub username is: {gh_username}"
-                        prompt += (
-                            f"\nWhen checking for issues assigned to the user, look for assignee \"{gh_username}\". "
-                            "Items in a project board that are assigned to this user are the user's tasks."
-                        )
 
             # Fetch accessible projects
             if sources:
@@ -104,10 +93,17 @@ class Agent:
         self.registry = registry or create_default_registry()
         self.client = genai.Client(api_key=settings.gemini_api_key)
         self.model = "gemini-2.0-flash"
+        self._tools: list[types.Tool] = []
+        self._tools_source: list[dict] | None = None
 
     def _build_tools(self) -> list[types.Tool]:
+        # The registry returns the same declarations list until a tool is
+        # registered, so the validated types.Tool can be reused across runs
         declarations = self.registry.gemini_declarations()
-        return [types.Tool(function_declarations=declarations)]
+        if declarations is not self._tools_source:
+            self._tools = [types.Tool(function_declarations=declarations)]
+            self._tools_source = declarations
+        return self._tools
 
     async def run(self, messages: list[dict]) -> AsyncIterator[str]:
         """Run the agent with tool use. Yields text tokens as they stream.
@@ -122,6 +118,7 @@ class Agent:
         )
 
         contents = [types.Content(**m) for m in messages]
+        tool_names = [d["name"] for d in self.registry.gemini_declarations()]
 
         max_iterations = 10
         for iteration in range(max_iterations):
@@ -140,7 +137,6 @@ class Agent:
                             parts_text.append(f"[result:{p.function_response.name}]")
                 msg_summary.append(f"  {role}: {' | '.join(parts_text)}")
 
-            tool_names = [d["name"] for d in self.registry.gemini_declarations()]
             logger.info(
                 f"=== LLM API Call (iteration {iteration + 1}/{max_iterations}) ===\n"
                 f"  Model: {self.model}\n"
@@ -148,7 +144,7 @@ class Agent:
                 f"  Messages ({len(contents)}):\n" + "\n".join(msg_summary)
             )
 
-            response = self.client.models.generate_content(
+            response = await self.client.aio.models.generate_content(
                 model=self.model,
                 contents=contents,
                 config=config,
@@ -191,10 +187,10 @@ class Agent:
                     logger.info(f"Tool call: {tool_name}({tool_args})")
                     yield f"\n[Using tool: {tool_name}]\n"
 
-                    tool = self.registry.get(tool_name)
-                    if tool:
+                    execute = self.registry.executor(tool_name)
+                    if execute:
                         try:
-                            result = await tool.execute(**tool_args)
+                            result = await execute(**tool_args)
                         except Exception as e:
                             result = f"Error executing {tool_name}: {e}"
                     else:
@@ -5,13 +5,16 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Literal
 
+import orjson
+
 from app.core.sandbox import resolve_sandboxed_path
-from app.services.integrations.google import GoogleDriveService, GoogleService
+from app.services.integrations.google import GoogleDriveService
+from app.services.tools.google_tools import get_google_service
 
 logger = logging.getLogger(__name__)
 
 # Shared service instances (same GoogleService as google_tools.py)
-_google_service = GoogleService()
+_google_service = get_google_service()
 _drive = GoogleDriveService(_google_service)
 
 # Cached root folder ID for the shared "ai-assistant" folder on Drive
@@ -29,21 +32,16 @@ async def _get_root_folder_id() -> str:
     if _root_folder_id:
         return _root_folder_id
 
-    headers = await _drive._google._get_headers()
-    import httpx
-
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            f"{_drive.BASE_URL}/files",
-            headers=headers,
-            params={
-                "q": "name = 'ai-assistant' and mimeType = 'application/vnd.google-apps.folder' and sharedWithMe",
-                "fields": "files(id,name)",
-                "pageSize": 1,
-            },
-        )
-        resp.raise_for_status()
-        files = resp.json().get("files", [])
+    resp = await _google_service._request(
+        "GET",
+        f"{_drive.BASE_PATH}/files",
+        params={
+            "q": "name = 'ai-assistant' and mimeType = 'application/vnd.google-apps.folder' and sharedWithMe",
+            "fields": "files(id,name)",
+            "pageSize": 1,
+        },
+    )
+    files = orjson.loads(resp.content).get("files", [])
 
     if not files:
         raise RuntimeError(
@@ -149,9 +147,7 @@ async def generate_weekly_summary() -> None:
 
         agent = Agent()
         messages = [{"role": "user", "parts": [{"text": full_prompt}]}]
-        summary = ""
-        async for token in agent.run(messages):
-            summary += token
+        summary = "".join([token async for token in agent.run(messages)])
 
         if not summary.strip():
             logger.warning("Agent returned empty weekly summary")
@@ -1,5 +1,8 @@
 """GitHub API integration - Projects, Repos, Issues."""
 
+import asyncio
+import functools
+import json
 import logging
 from typing import Any
 
@@ -9,6 +12,97 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent GraphQL calls when listing projects across owners, to stay
+# clear of GitHub's secondary rate limits
+_PROJECT_FANOUT = 8
+
+# Transient failures (gateway errors, secondary rate limits) are retried
+# this many times in total, backing off from _RETRY_BASE seconds up to
+# _RETRY_MAX; a longer Retry-After is surfaced to the caller instead.
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE = 0.2
+_RETRY_MAX = 2.0
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Max file bodies remembered for conditional (If-None-Match) re-reads
+_ETAG_CACHE_MAX = 128
+
+# --- GraphQL documents (built once at import) ---
+
+# Queries the login as both user and organization in one round trip;
+# whichever branch doesn't match comes back null.
+_Q_LIST_PROJECTS_OWNER = """
+query($owner: String!) {
+    user: user(login: $owner) {
+        projectsV2(first: 20) {
+            nodes { id number title shortDescription closed
+                    viewerCanUpdate
+                    owner { ... on User { login } ... on Organization { login } } }
+        }
+    }
+    org: organization(login: $owner) {
+        projectsV2(first: 20) {
+            nodes { id number title shortDescription closed
+                    viewerCanUpdate
+                    owner { ... on User { login } ... on Organization { login } } }
+        }
+    }
+}
+"""
+
+_Q_LIST_PROJECTS_VIEWER = """
+query {
+    viewer {
+        projectsV2(first: 20) {
+            nodes { id number title shortDescription closed
+                    owner { ... on User { login } ... on Organization { login } } }
+        }
+    }
+}
+"""
+
+_Q_LIST_PROJECT_ITEMS = """
+query($projectId: ID!, $first: Int!) {
+    node(id: $projectId) {
+        ... on ProjectV2 {
+            items(first: $first) {
+                nodes {
+                    id
+                    content {
+                        ... on Issue {
+                            title
+                            number
+                            state
+                            url
+                        }
+                        ... on PullRequest {
+                            title
+                            number
+                            state
+                            url
+                        }
+                        ... on DraftIssue {
+                            title
+                        }
+                    }
+                    status: fieldValueByName(name: "Status") {
+                        ... on ProjectV2ItemFieldSingleSelectValue { name }
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
+_M_ADD_PROJECT_DRAFT_ISSUE = """
+mutation($projectId: ID!, $title: String!, $body: String) {
+    addProjectV2DraftIssue(input: {projectId: $projectId, title: $title, body: $body}) {
+        projectItem { id }
+    }
+}
+"""
+
 
 class GitHubService:
     """GitHub API client using personal access token."""
@@ -16,60 +110,148 @@ class GitHubService:
     BASE_URL = "https://api.github.com"
     GRAPHQL_URL = "https://api.github.com/graphql"
 
+    # One connection pool for every GitHubService instance; the auth headers
+    # are fixed for the lifetime of the process, so they live on the client.
+    _client: httpx.AsyncClient | None = None
+    # LRU of (path, params) -> (etag, json) for conditional GETs; a 304 is
+    # free against the rate limit and skips re-downloading the body.
+    _etag_cache: dict[tuple, tuple[str, Any]] = {}
+    # (lowercased owner login, project number) -> project node ID
+    _project_ids: dict[tuple[str, int], str] = {}
+
     def __init__(self):
         self._token = settings.github_token
+        # In-flight GET requests keyed by (path, params) so concurrent
+        # identical reads share a single HTTP round trip.
+        self._inflight: dict[tuple, asyncio.Future[Any]] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        client = GitHubService._client
+        if client is None:
+            if not self._token:
+                raise ValueError("GitHub token not configured. Set ASSISTANT_GITHUB_TOKEN.")
+            client = GitHubService._client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                headers={
+                    "Authorization": f"Bearer {self._token}",
+                    "Accept": "application/vnd.github.v3+json",
+                    "X-GitHub-Api-Version": "2022-11-28",
+                },
+                # HTTP/2 lets concurrent tool calls multiplex over one connection
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=16),
+            )
+        return client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client (called on app shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+    async def _request(
+        self, method: str, url: str, retry: bool = True, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request, retrying transient failures when *retry* is set.
+
+        Only idempotent calls should retry; a mutation that hit a 502 may
+        already have been applied.
+        """
+        client = self._get_client()
+        if retry:
+            for attempt in range(_RETRY_ATTEMPTS - 1):
+                delay = min(_RETRY_BASE * 2**attempt, _RETRY_MAX)
+                try:
+                    resp = await client.request(method, url, **kwargs)
+                except httpx.TransportError:
+                    pass
+                else:
+                    transient = resp.status_code in _RETRY_STATUSES or (
+                        resp.status_code == 403 and "retry-after" in resp.headers
+                    )
+                    if not transient:
+                        return resp
+                    retry_after = resp.headers.get("retry-after", "")
+                    if retry_after.isdigit():
+                        if int(retry_after) > _RETRY_MAX:
+                            return resp
+                        delay = float(retry_after)
+                logger.debug("Retrying GitHub %s %s in %.1fs", method, url, delay)
+                await asyncio.sleep(delay)
+        return await client.request(method, url, **kwargs)
+
+    async def _fetch_json(
+        self, path: str, params: dict[str, Any] | None, key: tuple | None = None, **kwargs: Any
+    ) -> Any:
+        if key is None:
+            resp = await self._request("GET", path, params=params, **kwargs)
+            resp.raise_for_status()
+            return resp.json()
 
-    def _headers(self) -> dict[str, str]:
-        if not self._token:
-            raise ValueError("GitHub token not configured. Set ASSISTANT_GITHUB_TOKEN.")
-        return {
-            "Authorization": f"Bearer {self._token}",
-            "Accept": "application/vnd.github.v3+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
+        cache = GitHubService._etag_cache
+        cached = cache.pop(key, None)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        resp = await self._request("GET", path, params=params, headers=headers, **kwargs)
+        if resp.status_code == 304 and cached:
+            data = cached[1]
+            etag = cached[0]
+        else:
+            resp.raise_for_status()
+            data = resp.json()
+            etag = resp.headers.get("ETag")
+        if etag:
+            cache[key] = (etag, data)
+            if len(cache) > _ETAG_CACHE_MAX:
+                cache.pop(next(iter(cache)))
+        return data
+
+    async def _get(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+        conditional: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """GET a REST path and return the decoded JSON.
+
+        Concurrent callers asking for the same path and params await the
+        request that is already in flight instead of issuing their own.
+        With *conditional*, the last ETag is revalidated and a 304 reuses
+        the remembered body.
+        """
+        key = (path, tuple(sorted((params or {}).items())))
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._fetch_json(path, params, key if conditional else None, **kwargs)
+            )
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(pending)
 
     # --- REST API methods ---
 
+    async def get_authenticated_user(self) -> dict[str, Any]:
+        return await self._get("/user", timeout=5.0)
+
     async def list_repos(self, per_page: int = 20) -> list[dict[str, Any]]:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/user/repos",
-                headers=self._headers(),
-                params={"per_page": per_page, "sort": "updated"},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        return await self._get("/user/repos", {"per_page": per_page, "sort": "updated"})
 
     async def search_repos(self, query: str, per_page: int = 10) -> list[dict[str, Any]]:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/search/repositories",
-                headers=self._headers(),
-                params={"q": query, "per_page": per_page},
-            )
-            resp.raise_for_status()
-            return resp.json().get("items", [])
+        data = await self._get("/search/repositories", {"q": query, "per_page": per_page})
+        return data.get("items", [])
 
     async def get_repo(self, owner: str, repo: str) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}",
-                headers=self._headers(),
-            )
-            resp.raise_for_status()
-            return resp.json()
+        return await self._get(f"/repos/{owner}/{repo}")
 
     async def list_issues(
         self, owner: str, repo: str, state: str = "open", per_page: int = 20
     ) -> list[dict[str, Any]]:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/issues",
-                headers=self._headers(),
-                params={"state": state, "per_page": per_page},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        return await self._get(
+            f"/repos/{owner}/{repo}/issues", {"state": state, "per_page": per_page}
+        )
 
     async def create_issue(
         self, owner: str, repo: str, title: str, body: str = "", labels: list[str] | None = None
@@ -80,109 +262,67 @@ class GitHubService:
         if labels:
             payload["labels"] = labels
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/issues",
-                headers=self._headers(),
-                json=payload,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._request(
+            "POST", f"/repos/{owner}/{repo}/issues", retry=False, json=payload
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def get_issue(
         self, owner: str, repo: str, number: int,
     ) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/issues/{number}",
-                headers=self._headers(),
-            )
-            resp.raise_for_status()
-            issue = resp.json()
-
-            # Fetch comments
-            comments_resp = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/issues/{number}/comments",
-                headers=self._headers(),
-                params={"per_page": 30},
-            )
-            comments_resp.raise_for_status()
-            issue["_comments"] = comments_resp.json()
-
-            return issue
+        issue = await self._get(f"/repos/{owner}/{repo}/issues/{number}")
+        # Copy so the shared in-flight result isn't mutated under other callers
+        issue = {
+            **issue,
+            "_comments": await self._get(
+                f"/repos/{owner}/{repo}/issues/{number}/comments", {"per_page": 30}
+            ),
+        }
+        return issue
 
     async def read_file(self, owner: str, repo: str, path: str, ref: str = "main") -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/contents/{path}",
-                headers=self._headers(),
-                params={"ref": ref},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        return await self._get(
+            f"/repos/{owner}/{repo}/contents/{path}", {"ref": ref}, conditional=True
+        )
 
     # --- GraphQL methods for GitHub Projects ---
 
-    async def _graphql(self, query: str, variables: dict | None = None) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                self.GRAPHQL_URL,
-                headers=self._headers(),
-                json={"query": query, "variables": variables or {}},
+    async def _graphql(
+        self, query: str, variables: dict | None = None, allow_not_found: bool = False,
+    ) -> dict[str, Any]:
+        """Run a GraphQL query.
+
+        With *allow_not_found*, NOT_FOUND errors are tolerated as long as some
+        data came back (aliased lookups where only one branch can resolve).
+        """
+        resp = await self._request(
+            "POST",
+            self.GRAPHQL_URL,
+            retry=not query.lstrip().startswith("mutation"),
+            json={"query": query, "variables": variables or {}},
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        errors = data.get("errors")
+        if errors:
+            tolerated = allow_not_found and data.get("data") and all(
+                e.get("type") == "NOT_FOUND" for e in errors
             )
-            resp.raise_for_status()
-            data = resp.json()
-            if "errors" in data:
-                raise RuntimeError(f"GraphQL errors: {data['errors']}")
-            return data["data"]
+            if not tolerated:
+                raise RuntimeError(f"GraphQL errors: {errors}")
+        return data["data"]
 
     async def list_projects(self, owner: str | None = None) -> list[dict[str, Any]]:
         """List GitHub Projects (v2) for the authenticated user, a user, or an org."""
         if owner:
-            # Try as user first, fall back to organization
-            query = """
-            query($owner: String!) {
-                user(login: $owner) {
-                    projectsV2(first: 20) {
-                        nodes { id number title shortDescription closed
-                                viewerCanUpdate
-                                owner { ... on User { login } ... on Organization { login } } }
-                    }
-                }
-            }
-            """
-            try:
-                data = await self._graphql(query, {"owner": owner})
-                return data["user"]["projectsV2"]["nodes"]
-            except Exception:
-                pass
-
-            # Fall back to organization query
-            query = """
-            query($owner: String!) {
-                organization(login: $owner) {
-                    projectsV2(first: 20) {
-                        nodes { id number title shortDescription closed
-                                viewerCanUpdate
-                                owner { ... on User { login } ... on Organization { login } } }
-                    }
-                }
-            }
-            """
-            data = await self._graphql(query, {"owner": owner})
-            return data["organization"]["projectsV2"]["nodes"]
+            data = await self._graphql(_Q_LIST_PROJECTS_OWNER, {"owner": owner}, allow_not_found=True)
+            account = data.get("user") or data.get("org")
+            if account is None:
+                raise ValueError(f"No GitHub user or organization named {owner}")
+            return account["projectsV2"]["nodes"]
         else:
-            query = """
-            query {
-                viewer {
-                    projectsV2(first: 20) {
-                        nodes { id number title shortDescription closed
-                                owner { ... on User { login } ... on Organization { login } } }
-                    }
-                }
-            }
-            """
-            data = await self._graphql(query)
+            data = await self._graphql(_Q_LIST_PROJECTS_VIEWER)
             return data["viewer"]["projectsV2"]["nodes"]
 
     async def list_accessible_projects(
@@ -194,95 +334,93 @@ class GitHubService:
         viewer's own projects plus projects belonging to *extra_owners*.
         Only projects where the viewer has access are returned.
         """
+        owners = extra_owners or []
+        slots = asyncio.Semaphore(_PROJECT_FANOUT)
+
+        async def fetch(owner: str | None) -> list[dict[str, Any]]:
+            async with slots:
+                return await self.list_projects(owner=owner)
+
+        # The viewer's own projects plus every extra owner's, fetched concurrently
+        fetched = await asyncio.gather(
+            fetch(None), *(fetch(owner) for owner in owners), return_exceptions=True
+        )
+
         seen_ids: set[str] = set()
         results: list[dict[str, Any]] = []
-
-        # Viewer's own projects
-        try:
-            own = await self.list_projects()
-            for p in own:
+        for i, projects in enumerate(fetched):
+            if isinstance(projects, BaseException):
+                continue
+            for p in projects:
                 pid = p.get("id", "")
-                if pid not in seen_ids:
+                # Other owners' projects only count if the viewer can edit them
+                if pid not in seen_ids and (i == 0 or p.get("viewerCanUpdate")):
                     seen_ids.add(pid)
                     results.append(p)
-        except Exception:
-            pass
-
-        # Projects from extra owners
-        for owner in extra_owners or []:
-            try:
-                projects = await self.list_projects(owner=owner)
-                for p in projects:
-                    pid = p.get("id", "")
-                    if pid not in seen_ids and p.get("viewerCanUpdate"):
-                        seen_ids.add(pid)
-                        results.append(p)
-            except Exception:
-                pass
 
         return results
 
     async def resolve_project_id(self, owner: str, number: int) -> str:
         """Resolve a project owner + number to a GraphQL node ID."""
-        projects = await self.list_projects(owner=owner)
-        for p in projects:
-            if p.get("number") == number:
-                return p["id"]
-        raise ValueError(f"Project #{number} not found for {owner}")
+        cache = GitHubService._project_ids
+        key = (owner.lower(), number)
+        if key not in cache:
+            # Node IDs never change, so remember every project the listing returned
+            for p in await self.list_projects(owner=owner):
+                cache[(owner.lower(), p.get("number"))] = p["id"]
+        try:
+            return cache[key]
+        except KeyError:
+            raise ValueError(f"Project #{number} not found for {owner}") from None
 
     async def list_project_items(self, project_id: str, first: int = 50) -> list[dict[str, Any]]:
-        query = """
-        query($projectId: ID!, $first: Int!) {
-            node(id: $projectId) {
-                ... on ProjectV2 {
-                    items(first: $first) {
-                        nodes {
-                            id
-                            content {
-                                ... on Issue {
-                                    title
-                                    number
-                                    state
-                                    url
-                                }
-                                ... on PullRequest {
-                                    title
-                                    number
-                                    state
-                                    url
-                                }
-                                ... on DraftIssue {
-                                    title
-                                }
-                            }
-                            fieldValues(first: 10) {
-                                nodes {
-                                    ... on ProjectV2ItemFieldSingleSelectValue {
-                                        name
-                                        field { ... on ProjectV2SingleSelectField { name } }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-        """
-        data = await self._graphql(query, {"projectId": project_id, "first": first})
+        data = await self._graphql(_Q_LIST_PROJECT_ITEMS, {"projectId": project_id, "first": first})
         return data["node"]["items"]["nodes"]
 
     async def add_project_draft_issue(
         self, project_id: str, title: str, body: str = ""
     ) -> dict[str, Any]:
-        query = """
-        mutation($projectId: ID!, $title: String!, $body: String) {
-            addProjectV2DraftIssue(input: {projectId: $projectId, title: $title, body: $body}) {
-                projectItem { id }
-            }
-        }
-        """
-        data = await self._graphql(query, {
+        data = await self._graphql(_M_ADD_PROJECT_DRAFT_ISSUE, {
             "projectId": project_id, "title": title, "body": body
         })
         return data["addProjectV2DraftIssue"]["projectItem"]
+
+
+# --- Project sources (owners/repos whose projects the agent tracks) ---
+
+_SOURCES_FILE = settings.data_dir / "github_project_sources.json"
+
+# (mtime_ns, size, sources) of the last parse of _SOURCES_FILE
+_sources_cache: tuple[int, int, list[str]] | None = None
+
+
+def load_project_sources() -> list[str]:
+    """Return the configured project sources, re-reading the file only when it changes."""
+    global _sources_cache
+    try:
+        st = _SOURCES_FILE.stat()
+    except FileNotFoundError:
+        return []
+    if _sources_cache and _sources_cache[:2] == (st.st_mtime_ns, st.st_size):
+        return list(_sources_cache[2])
+    try:
+        sources = json.loads(_SOURCES_FILE.read_text())
+    except (OSError, ValueError):
+        return []
+    _sources_cache = (st.st_mtime_ns, st.st_size, sources)
+    return list(sources)
+
+
+def save_project_sources(sources: list[str]) -> None:
+    settings.data_dir.mkdir(parents=True, exist_ok=True)
+    _SOURCES_FILE.write_text(json.dumps(sources))
+
+
+@functools.cache
+def get_github() -> GitHubService:
+    """Return the process-wide GitHubService.
+
+    Sharing one instance lets the tools, the agent and the API coalesce
+    identical in-flight reads with each other.
+    """
+    return GitHubService()
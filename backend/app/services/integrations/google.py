@@ -4,15 +4,28 @@ Uses Google API client with service account or OAuth credentials.
 The credentials path is configured via ASSISTANT_GOOGLE_CREDENTIALS_PATH.
 """
 
+import asyncio
+import functools
 import logging
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
+import orjson
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from sqlalchemy import delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
 
 from app.core.config import settings
+from app.core.database import engine
+from app.models.gmail import GmailMessage
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +35,187 @@ SCOPES = [
     "https://www.googleapis.com/auth/gmail.modify",
 ]
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Adaptive concurrency for Google API calls: grow by _AIMD_INCREASE after
+# each fast success, shrink by _AIMD_DECREASE on 429/5xx, never above
+# settings.google_max_concurrency.
+_AIMD_INCREASE = 0.5
+_AIMD_DECREASE = 0.5
+_TARGET_LATENCY = 1.0  # seconds
+_MAX_RETRIES = 3
+_RETRY_AFTER_MAX = 30  # seconds; a longer Retry-After is surfaced to the caller instead
+_ETAG_CACHE_MAX = 256
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Tokens are refreshed in the background once they are this close to expiry,
+# so re-checking validity only every _CREDENTIAL_CHECK_INTERVAL is safe.
+_CREDENTIAL_CHECK_INTERVAL = 30  # seconds
+_PROACTIVE_REFRESH = timedelta(minutes=5)
+
+# Only the fields the Drive tools and note sync actually read
+_LIST_FIELDS = "files(id,name,mimeType,modifiedTime,webViewLink)"
+_LIST_TTL = 30  # seconds
+_LIST_CACHE_MAX = 128
+_FOLDER_TTL = 300  # 5 minutes
+_FOLDER_CACHE_MAX = 128
+
+# Fixed pieces of the multipart/related upload body, encoded once
+_UPLOAD_BOUNDARY = "----AssistantUploadBoundary"
+_UPLOAD_METADATA_HEAD = (
+    f"--{_UPLOAD_BOUNDARY}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n".encode()
+)
+_UPLOAD_CONTENT_HEAD = f"\r\n--{_UPLOAD_BOUNDARY}\r\nContent-Type: ".encode()
+_UPLOAD_TAIL = f"\r\n--{_UPLOAD_BOUNDARY}--".encode()
+
+# The shared client's base URL; Calendar and Drive requests use paths relative
+# to it, Gmail keeps absolute URLs on its own host.
+API_HOST = "https://www.googleapis.com"
+GMAIL_BATCH_URL = "/batch/gmail/v1"
+CALENDAR_BATCH_URL = "/batch/calendar/v3"
+_CALENDAR_BATCH_LIMIT = 50
+_BATCH_LIMIT = 100  # Gmail rejects batches with more sub-requests than this
+_FETCH_CONCURRENCY = 8
+_MESSAGE_TTL = 300  # 5 minutes
+_MESSAGE_CACHE_MAX = 500
+# Stored full messages are reused for this long, then refetched so label
+# changes and deletions show up; older rows are pruned on the next store.
+_STORED_MESSAGE_TTL = timedelta(hours=1)
+_METADATA_QUERY = "format=metadata&metadataHeaders=Subject&metadataHeaders=From&metadataHeaders=Date"
+_BLANK_LINE = re.compile(rb"\r?\n\r?\n")
+
+
+def _build_batch_body(boundary: str, requests: dict[str, str | tuple[str, Any]]) -> bytes:
+    """Pack sub-requests into a multipart/mixed batch body.
+
+    *requests* maps a content ID to either a request line such as
+    ``"GET /path?query"`` or a ``(request_line, json_body)`` pair.
+    """
+    parts: list[bytes] = []
+    for content_id, request in requests.items():
+        request_line, payload = request if isinstance(request, tuple) else (request, None)
+        parts.append(
+            f"--{boundary}\r\n"
+            f"Content-Type: application/http\r\n"
+            f"Content-ID: <{content_id}>\r\n\r\n"
+            f"{request_line}\r\n".encode()
+        )
+        if payload is None:
+            parts.append(b"\r\n")
+        else:
+            parts.append(b"Content-Type: application/json\r\n\r\n")
+            parts.append(orjson.dumps(payload) + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts)
+
+
+def _split_head(block: bytes) -> tuple[bytes, bytes]:
+    """Split a MIME/HTTP block into its header section and body."""
+    parts = _BLANK_LINE.split(block, maxsplit=1)
+    return parts[0], parts[1] if len(parts) > 1 else b""
+
+
+def _parse_batch_response(content_type: str, content: bytes) -> dict[str, tuple[int, Any]]:
+    """Split a multipart/mixed batch response into ``{content_id: (status, json)}``."""
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        raise ValueError(f"Batch response has no boundary: {content_type}")
+
+    results: dict[str, tuple[int, Any]] = {}
+    for part in content.split(b"--" + match.group(1).encode()):
+        part = part.strip()
+        if not part or part == b"--":
+            continue
+        # Each part wraps a full HTTP response: outer MIME headers, then
+        # status line + response headers, then the JSON body.
+        outer, http_msg = _split_head(part)
+        cid = re.search(rb"Content-ID:\s*<response-([^>]+)>", outer, re.IGNORECASE)
+        if cid is None:
+            continue
+        head, body = _split_head(http_msg)
+        status = int(head.split(None, 2)[1])
+        results[cid.group(1).decode()] = (status, orjson.loads(body) if body.strip() else None)
+    return results
+
+
+def _utcnow() -> datetime:
+    # google-auth stores expiry as a naive UTC datetime
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _log_refresh_failure(task: asyncio.Task[None]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Google token refresh failed: {task.exception()}")
+
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> float | None:
+    """Seconds to wait before retrying: Retry-After if given, else jittered backoff.
+
+    Returns None when the server asks to wait longer than _RETRY_AFTER_MAX.
+    """
+    retry_after = resp.headers.get("retry-after", "")
+    if retry_after.isdigit():
+        delay = float(retry_after)
+        return delay if delay <= _RETRY_AFTER_MAX else None
+    return 2 ** attempt + random.random()
+
+
+def _q_literal(value: str) -> str:
+    """Quote a value as a Drive query string literal."""
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+@functools.lru_cache(maxsize=256)
+def _files_query(query: str, folder_id: str | None) -> str:
+    """Build the Drive ``q`` filter for a name search within an optional folder."""
+    q_parts = []
+    if query:
+        q_parts.append(f"name contains {_q_literal(query)}")
+    if folder_id:
+        q_parts.append(f"{_q_literal(folder_id)} in parents")
+    q_parts.append("trashed = false")
+    return " and ".join(q_parts)
+
+
+@functools.lru_cache(maxsize=256)
+def _folder_query(name: str, parent_id: str | None) -> str:
+    """Build the Drive ``q`` filter for a folder with an exact name."""
+    q_parts = [
+        f"name = {_q_literal(name)}",
+        "mimeType = 'application/vnd.google-apps.folder'",
+        "trashed = false",
+    ]
+    if parent_id:
+        q_parts.append(f"{_q_literal(parent_id)} in parents")
+    return " and ".join(q_parts)
+
+
+class _AdaptiveLimiter:
+    """Concurrency limit adjusted with AIMD (additive increase, multiplicative decrease)."""
+
+    def __init__(self, ceiling: int):
+        self._ceiling = ceiling
+        self._limit = float(ceiling)
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < max(1, int(self._limit)))
+            self._active += 1
+
+    async def __aexit__(self, *exc: object) -> None:
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def record_success(self, latency: float) -> None:
+        if latency < _TARGET_LATENCY:
+            self._limit = min(self._ceiling, self._limit + _AIMD_INCREASE)
+
+    def record_throttle(self) -> None:
+        self._limit = max(1.0, self._limit * _AIMD_DECREASE)
+
 
 class GoogleService:
     """Manages Google API access using OAuth credentials from a JSON file."""
@@ -29,6 +223,120 @@ class GoogleService:
     def __init__(self):
         self._credentials_path = settings.google_credentials_path
         self._credentials: Credentials | None = None
+        # One transport for token refreshes instead of a new Request() each time
+        self._auth_request = Request()
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._etag_cache: dict[tuple, tuple[str, Any]] = {}
+        self._client: httpx.AsyncClient | None = None
+        self._limiter = _AdaptiveLimiter(settings.google_max_concurrency)
+        self._cached_token: str | None = None
+        self._cached_headers: dict[str, str] | None = None
+        self._last_check = 0.0
+        # Only a positive result is remembered, so a credentials file added
+        # after startup is still picked up.
+        self._configured = False
+
+    async def client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client shared by the Calendar/Drive/Gmail wrappers."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=API_HOST,
+                http2=True,
+                timeout=30,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (called on app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(
+        self, method: str, url: str, ok_statuses: tuple[int, ...] = (), **kwargs: Any
+    ) -> httpx.Response:
+        """Send an authorized request under the adaptive concurrency limit.
+
+        429 and 5xx responses shrink the limit and are retried with
+        exponential backoff (or the server's Retry-After); POSTs are only
+        retried on 429. The final response is checked with raise_for_status
+        unless its status is listed in *ok_statuses*.
+        """
+        client = await self.client()
+        extra_headers = kwargs.pop("headers", None) or {}
+        for attempt in range(_MAX_RETRIES + 1):
+            headers = {**await self._get_headers(), **extra_headers}
+            async with self._limiter:
+                start = time.monotonic()
+                resp = await client.request(method, url, headers=headers, **kwargs)
+                latency = time.monotonic() - start
+
+            if resp.status_code not in _RETRY_STATUSES:
+                self._limiter.record_success(latency)
+                break
+            self._limiter.record_throttle()
+            # A POST that hit a 5xx may have been applied; only a 429 is safe to resend
+            if attempt == _MAX_RETRIES or (method == "POST" and resp.status_code != 429):
+                break
+            delay = _retry_delay(resp, attempt)
+            if delay is None:
+                break
+            logger.warning(
+                f"Google API returned {resp.status_code} for {method} {url}; "
+                f"retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+        if resp.status_code not in ok_statuses:
+            resp.raise_for_status()
+        return resp
+
+    async def _batch(
+        self, batch_url: str, requests: dict[str, str | tuple[str, Any]]
+    ) -> dict[str, tuple[int, Any]]:
+        """POST sub-requests to a batch endpoint; returns ``{content_id: (status, json)}``."""
+        boundary = f"batch_{uuid.uuid4().hex}"
+        resp = await self._request(
+            "POST",
+            batch_url,
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+            content=_build_batch_body(boundary, requests),
+        )
+        return _parse_batch_response(resp.headers.get("content-type", ""), resp.content)
+
+    async def _get_json(self, url: str, params: dict[str, Any] | None = None) -> Any:
+        """GET a JSON resource, revalidating a previously seen copy by ETag.
+
+        A 304 reply reuses the payload decoded last time instead of
+        downloading and parsing the body again.
+        """
+        key = (url, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+        cached = self._etag_cache.pop(key, None)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        resp = await self._request("GET", url, ok_statuses=(304,), params=params, headers=headers)
+
+        if resp.status_code == 304 and cached:
+            data = cached[1]
+        else:
+            data = orjson.loads(resp.content)
+            etag = resp.headers.get("etag")
+            cached = (etag, data) if etag else None
+        if cached:
+            if len(self._etag_cache) >= _ETAG_CACHE_MAX:
+                self._etag_cache.pop(next(iter(self._etag_cache)))
+            # Re-inserted on every hit, so the first entry is least recently used
+            self._etag_cache[key] = cached
+        return data
+
+    async def warm_up(self) -> None:
+        """Load (and if needed refresh) credentials before the first API call."""
+        if not self.is_configured:
+            return
+        try:
+            await asyncio.to_thread(self._get_credentials)
+        except Exception as e:
+            logger.warning(f"Could not preload Google credentials: {e}")
 
     def _load_credentials(self) -> Credentials | None:
         """Load OAuth credentials from the configured JSON file."""
@@ -36,19 +344,18 @@ class GoogleService:
             return None
 
         creds_file = Path(self._credentials_path)
-        if not creds_file.exists():
+        try:
+            info = orjson.loads(creds_file.read_bytes())
+            return Credentials.from_authorized_user_info(info, SCOPES)
+        except FileNotFoundError:
             logger.warning(f"Google credentials file not found: {creds_file}")
             return None
-
-        try:
-            creds = Credentials.from_authorized_user_file(str(creds_file), SCOPES)
-            return creds
         except Exception as e:
             logger.error(f"Failed to load Google credentials: {e}")
             return None
 
-    def _get_credentials(self) -> Credentials:
-        """Get valid credentials, refreshing if needed."""
+    def _require_credentials(self) -> Credentials:
+        """Return the loaded credentials (without refreshing) or raise if unconfigured."""
         if self._credentials is None:
             self._credentials = self._load_credentials()
 
@@ -57,13 +364,44 @@ class GoogleService:
                 "Google credentials not configured. "
                 "Set ASSISTANT_GOOGLE_CREDENTIALS_PATH to your OAuth credentials JSON file."
             )
+        return self._credentials
 
-        if self._credentials.expired and self._credentials.refresh_token:
-            self._credentials.refresh(Request())
-            # Save refreshed token back to file
-            self._save_credentials()
+    def _get_credentials(self) -> Credentials:
+        """Get valid credentials, refreshing if needed."""
+        creds = self._require_credentials()
+        if creds.expired and creds.refresh_token:
+            self._refresh_and_save()
+        return creds
+
+    def _refresh_and_save(self) -> None:
+        self._credentials.refresh(self._auth_request)
+        # Save refreshed token back to file
+        self._save_credentials()
+
+    def _start_refresh(self) -> asyncio.Task[None]:
+        """Start a token refresh in a worker thread, or join the one in progress."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(asyncio.to_thread(self._refresh_and_save))
+            self._refresh_task.add_done_callback(_log_refresh_failure)
+        return self._refresh_task
+
+    async def _get_fresh_credentials(self) -> Credentials:
+        """Get credentials for a request without blocking on OAuth when avoidable.
+
+        Tokens close to expiry are refreshed in the background while the
+        current one is still used; callers only wait when there is no
+        usable token left.
+        """
+        creds = self._require_credentials()
+        if not creds.refresh_token:
+            return creds
 
-        return self._credentials
+        remaining = creds.expiry - _utcnow() if creds.expiry else None
+        if not creds.token or (remaining is not None and remaining <= timedelta(0)):
+            await self._start_refresh()
+        elif remaining is not None and remaining < _PROACTIVE_REFRESH:
+            self._start_refresh()
+        return creds
 
     def _save_credentials(self) -> None:
         """Save current credentials back to the JSON file (preserves refresh token)."""
@@ -72,29 +410,45 @@ class GoogleService:
         try:
             creds_file = Path(self._credentials_path)
             creds_file.write_text(self._credentials.to_json())
+            self._configured = True
         except Exception as e:
             logger.error(f"Failed to save refreshed credentials: {e}")
 
     async def _get_headers(self) -> dict[str, str]:
-        """Get authorization headers with a valid access token."""
-        creds = self._get_credentials()
-        return {
-            "Authorization": f"Bearer {creds.token}",
-            "Content-Type": "application/json",
-        }
+        """Get authorization headers with a valid access token.
+
+        The headers dict is rebuilt only when the token changes, and the
+        expiry check runs at most once per _CREDENTIAL_CHECK_INTERVAL.
+        """
+        now = time.monotonic()
+        if self._cached_headers is not None and now - self._last_check < _CREDENTIAL_CHECK_INTERVAL:
+            return self._cached_headers
+
+        creds = await self._get_fresh_credentials()
+        self._last_check = now
+        if self._cached_headers is None or creds.token != self._cached_token:
+            self._cached_token = creds.token
+            self._cached_headers = {
+                "Authorization": f"Bearer {creds.token}",
+                "Content-Type": "application/json",
+            }
+        return self._cached_headers
 
     @property
     def is_configured(self) -> bool:
         """Check if Google credentials are available."""
+        if self._configured:
+            return True
         if not self._credentials_path:
             return False
-        return Path(self._credentials_path).exists()
+        self._configured = Path(self._credentials_path).exists()
+        return self._configured
 
 
 class GoogleCalendarService:
     """Google Calendar API wrapper."""
 
-    BASE_URL = "https://www.googleapis.com/calendar/v3"
+    BASE_PATH = "/calendar/v3"
 
     def __init__(self, google: GoogleService):
         self._google = google
@@ -116,16 +470,10 @@ class GoogleCalendarService:
         if time_max:
             params["timeMax"] = time_max
 
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/calendars/{calendar_id}/events",
-                headers=headers,
-                params=params,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return data.get("items", [])
+        data = await self._google._get_json(
+            f"{self.BASE_PATH}/calendars/{calendar_id}/events", params
+        )
+        return data.get("items", [])
 
     async def create_event(
         self,
@@ -146,15 +494,34 @@ class GoogleCalendarService:
         if location:
             body["location"] = location
 
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.BASE_URL}/calendars/{calendar_id}/events",
-                headers=headers,
-                json=body,
+        resp = await self._google._request(
+            "POST",
+            f"{self.BASE_PATH}/calendars/{calendar_id}/events",
+            content=orjson.dumps(body),
+        )
+        return orjson.loads(resp.content)
+
+    async def create_events_bulk(
+        self, events: list[dict[str, Any]], calendar_id: str = "primary"
+    ) -> list[dict[str, Any]]:
+        """Create several events through the Calendar batch endpoint.
+
+        *events* are full event resources. Results come back in input order;
+        an event that failed is returned as its error body (with an "error" key).
+        """
+        path = f"POST /calendar/v3/calendars/{calendar_id}/events"
+        results: list[dict[str, Any]] = []
+        for start in range(0, len(events), _CALENDAR_BATCH_LIMIT):
+            chunk = events[start:start + _CALENDAR_BATCH_LIMIT]
+            parts = await self._google._batch(
+                CALENDAR_BATCH_URL, {str(i): (path, event) for i, event in enumerate(chunk)}
             )
-            resp.raise_for_status()
-            return resp.json()
+            for i in range(len(chunk)):
+                status, data = parts.get(str(i), (0, None))
+                if status != 200:
+                    logger.warning(f"Batched event creation failed with status {status}")
+                results.append(data or {"error": {"code": status}})
+        return results
 
     async def update_event(
         self,
@@ -162,34 +529,54 @@ class GoogleCalendarService:
         updates: dict[str, Any],
         calendar_id: str = "primary",
     ) -> dict[str, Any]:
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.patch(
-                f"{self.BASE_URL}/calendars/{calendar_id}/events/{event_id}",
-                headers=headers,
-                json=updates,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._google._request(
+            "PATCH",
+            f"{self.BASE_PATH}/calendars/{calendar_id}/events/{event_id}",
+            content=orjson.dumps(updates),
+        )
+        return orjson.loads(resp.content)
 
     async def delete_event(self, event_id: str, calendar_id: str = "primary") -> None:
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.delete(
-                f"{self.BASE_URL}/calendars/{calendar_id}/events/{event_id}",
-                headers=headers,
-            )
-            resp.raise_for_status()
+        await self._google._request(
+            "DELETE",
+            f"{self.BASE_PATH}/calendars/{calendar_id}/events/{event_id}",
+        )
+
+    async def delete_events_bulk(
+        self, event_ids: list[str], calendar_id: str = "primary"
+    ) -> list[str]:
+        """Delete several events through the Calendar batch endpoint.
+
+        Returns the IDs that could not be deleted.
+        """
+        failed: list[str] = []
+        for start in range(0, len(event_ids), _CALENDAR_BATCH_LIMIT):
+            chunk = event_ids[start:start + _CALENDAR_BATCH_LIMIT]
+            parts = await self._google._batch(CALENDAR_BATCH_URL, {
+                str(i): f"DELETE /calendar/v3/calendars/{calendar_id}/events/{event_id}"
+                for i, event_id in enumerate(chunk)
+            })
+            for i, event_id in enumerate(chunk):
+                status, _ = parts.get(str(i), (0, None))
+                # 410 Gone: the event was already deleted
+                if status not in (200, 204, 410):
+                    logger.warning(f"Batched event deletion failed with status {status}")
+                    failed.append(event_id)
+        return failed
 
 
 class GoogleDriveService:
     """Google Drive API wrapper."""
 
-    BASE_URL = "https://www.googleapis.com/drive/v3"
-    UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3"
+    BASE_PATH = "/drive/v3"
+    UPLOAD_PATH = "/upload/drive/v3"
 
     def __init__(self, google: GoogleService):
         self._google = google
+        # Short-lived list_files results; cleared on every write so the
+        # exists-then-upload checks in drive_sync never see stale listings.
+        self._list_cache: dict[tuple, tuple[list[dict[str, Any]], float]] = {}
+        self._folder_cache: dict[tuple[str, str | None], tuple[dict[str, Any], float]] = {}
 
     async def list_files(
         self,
@@ -197,91 +584,90 @@ class GoogleDriveService:
         max_results: int = 20,
         folder_id: str | None = None,
     ) -> list[dict[str, Any]]:
-        q_parts = []
-        if query:
-            q_parts.append(f"name contains '{query}'")
-        if folder_id:
-            q_parts.append(f"'{folder_id}' in parents")
-        q_parts.append("trashed = false")
+        key = (query, folder_id, max_results)
+        cached = self._list_cache.get(key)
+        if cached and time.time() - cached[1] < _LIST_TTL:
+            return cached[0]
 
         params: dict[str, Any] = {
             "pageSize": max_results,
-            "fields": "files(id,name,mimeType,size,modifiedTime,webViewLink)",
-            "q": " and ".join(q_parts),
+            "fields": _LIST_FIELDS,
+            "q": _files_query(query, folder_id),
         }
 
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/files",
-                headers=headers,
-                params=params,
-            )
-            resp.raise_for_status()
-            return resp.json().get("files", [])
+        data = await self._google._get_json(f"{self.BASE_PATH}/files", params)
+        files = data.get("files", [])
 
-    async def download_file(self, file_id: str) -> bytes:
+        now = time.time()
+        cache = self._list_cache
+        for stale in [k for k, (_, ts) in cache.items() if now - ts >= _LIST_TTL]:
+            del cache[stale]
+        if len(cache) >= _LIST_CACHE_MAX:
+            cache.pop(next(iter(cache)))
+        cache[key] = (files, now)
+        return files
+
+    async def download_file_stream(self, file_id: str) -> AsyncIterator[bytes]:
+        """Stream a file's content in chunks without buffering it all in memory."""
         headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/files/{file_id}",
+        client = await self._google.client()
+        # Held for the whole transfer so long downloads count against the limit
+        async with self._google._limiter:
+            async with client.stream(
+                "GET",
+                f"{self.BASE_PATH}/files/{file_id}",
                 headers=headers,
                 params={"alt": "media"},
-            )
-            resp.raise_for_status()
-            return resp.content
+            ) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    yield chunk
+
+    async def download_file(self, file_id: str) -> bytes:
+        """Download a whole file into memory; prefer download_file_stream for large files."""
+        return b"".join([chunk async for chunk in self.download_file_stream(file_id)])
 
     async def upload_file(
         self, name: str, content: bytes, mime_type: str, folder_id: str | None = None
     ) -> dict[str, Any]:
         """Upload a file using multipart upload (metadata + content in one request)."""
-        import json as _json
-
         metadata: dict[str, Any] = {"name": name}
         if folder_id:
             metadata["parents"] = [folder_id]
 
-        boundary = "----AssistantUploadBoundary"
-        metadata_json = _json.dumps(metadata)
-        body = (
-            f"--{boundary}\r\n"
-            f"Content-Type: application/json; charset=UTF-8\r\n\r\n"
-            f"{metadata_json}\r\n"
-            f"--{boundary}\r\n"
-            f"Content-Type: {mime_type}\r\n\r\n"
-        ).encode() + content + f"\r\n--{boundary}--".encode()
-
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.UPLOAD_URL}/files",
-                headers={
-                    "Authorization": headers["Authorization"],
-                    "Content-Type": f"multipart/related; boundary={boundary}",
-                },
-                params={"uploadType": "multipart"},
-                content=body,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        body = b"".join([
+            _UPLOAD_METADATA_HEAD,
+            orjson.dumps(metadata),
+            _UPLOAD_CONTENT_HEAD,
+            mime_type.encode(),
+            b"\r\n\r\n",
+            content,
+            _UPLOAD_TAIL,
+        ])
+
+        resp = await self._google._request(
+            "POST",
+            f"{self.UPLOAD_PATH}/files",
+            headers={"Content-Type": f"multipart/related; boundary={_UPLOAD_BOUNDARY}"},
+            params={"uploadType": "multipart"},
+            content=body,
+        )
+        self._list_cache.clear()
+        return orjson.loads(resp.content)
 
     async def update_file(
         self, file_id: str, content: bytes, mime_type: str
     ) -> dict[str, Any]:
         """Update an existing file's content."""
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.patch(
-                f"{self.UPLOAD_URL}/files/{file_id}",
-                headers={
-                    "Authorization": headers["Authorization"],
-                    "Content-Type": mime_type,
-                },
-                params={"uploadType": "media"},
-                content=content,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._google._request(
+            "PATCH",
+            f"{self.UPLOAD_PATH}/files/{file_id}",
+            headers={"Content-Type": mime_type},
+            params={"uploadType": "media"},
+            content=content,
+        )
+        self._list_cache.clear()
+        return orjson.loads(resp.content)
 
     async def create_folder(
         self, name: str, parent_id: str | None = None
@@ -294,93 +680,198 @@ class GoogleDriveService:
         if parent_id:
             metadata["parents"] = [parent_id]
 
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.BASE_URL}/files",
-                headers=headers,
-                json=metadata,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._google._request(
+            "POST",
+            f"{self.BASE_PATH}/files",
+            content=orjson.dumps(metadata),
+        )
+        self._list_cache.clear()
+        return orjson.loads(resp.content)
 
     async def find_or_create_folder(
         self, name: str, parent_id: str | None = None
     ) -> dict[str, Any]:
         """Find an existing folder by name within parent, or create it."""
-        q_parts = [
-            f"name = '{name}'",
-            "mimeType = 'application/vnd.google-apps.folder'",
-            "trashed = false",
-        ]
-        if parent_id:
-            q_parts.append(f"'{parent_id}' in parents")
-
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/files",
-                headers=headers,
-                params={
-                    "q": " and ".join(q_parts),
-                    "fields": "files(id,name)",
-                    "pageSize": 1,
-                },
-            )
-            resp.raise_for_status()
-            files = resp.json().get("files", [])
+        key = (name, parent_id)
+        cached = self._folder_cache.get(key)
+        if cached and time.time() - cached[1] < _FOLDER_TTL:
+            return cached[0]
+
+        resp = await self._google._request(
+            "GET",
+            f"{self.BASE_PATH}/files",
+            params={
+                "q": _folder_query(name, parent_id),
+                "fields": "files(id,name)",
+                "pageSize": 1,
+            },
+        )
+        files = orjson.loads(resp.content).get("files", [])
 
-        if files:
-            return files[0]
-        return await self.create_folder(name, parent_id)
+        folder = files[0] if files else await self.create_folder(name, parent_id)
+        if len(self._folder_cache) >= _FOLDER_CACHE_MAX:
+            self._folder_cache.pop(next(iter(self._folder_cache)))
+        self._folder_cache[key] = (folder, time.time())
+        return folder
 
     async def search(self, query: str, max_results: int = 10) -> list[dict[str, Any]]:
         return await self.list_files(query=query, max_results=max_results)
 
 
+# --- Local store of full Gmail messages ---
+# A failing store only costs a refetch, so database errors are logged and
+# treated as cache misses.
+
+
+def _stored_message_cutoff() -> datetime:
+    return datetime.now(timezone.utc) - _STORED_MESSAGE_TTL
+
+
+def _load_stored_messages(msg_ids: list[str]) -> dict[str, dict[str, Any]]:
+    try:
+        with Session(engine) as session:
+            rows = session.exec(
+                select(GmailMessage).where(
+                    GmailMessage.id.in_(msg_ids),
+                    GmailMessage.fetched_at >= _stored_message_cutoff(),
+                )
+            ).all()
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not read stored Gmail messages: {e}")
+        return {}
+    return {row.id: orjson.loads(row.payload) for row in rows}
+
+
+def _store_messages(messages: list[dict[str, Any]]) -> None:
+    try:
+        with Session(engine) as session:
+            session.exec(
+                delete(GmailMessage).where(
+                    GmailMessage.fetched_at < _stored_message_cutoff()
+                )
+            )
+            for msg in messages:
+                session.merge(GmailMessage(id=msg["id"], payload=orjson.dumps(msg)))
+            session.commit()
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not store Gmail messages: {e}")
+
+
 class GoogleGmailService:
     """Google Gmail API wrapper."""
 
     BASE_URL = "https://gmail.googleapis.com/gmail/v1"
+    UPLOAD_URL = "https://gmail.googleapis.com/upload/gmail/v1"
 
     def __init__(self, google: GoogleService):
         self._google = google
+        self._message_cache: dict[str, tuple[dict[str, Any], float]] = {}
+        # Bounds concurrent Gmail requests so large fan-outs don't trip 429s
+        self._fetch_slots = asyncio.Semaphore(_FETCH_CONCURRENCY)
 
     async def list_messages(
         self, query: str = "", max_results: int = 10
     ) -> list[dict[str, Any]]:
-        params: dict[str, Any] = {"maxResults": max_results}
+        """List messages with their Subject/From/Date headers and snippet.
+
+        Costs one list call plus one batch call for any messages not already
+        cached. Use read_message for the full MIME payload.
+        """
+        # The list endpoint can't return headers, so only ask it for IDs
+        params: dict[str, Any] = {"maxResults": max_results, "fields": "messages/id"}
         if query:
             params["q"] = query
 
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/users/me/messages",
-                headers=headers,
-                params=params,
-            )
-            resp.raise_for_status()
-            messages = resp.json().get("messages", [])
-
-            # Fetch details for each message
-            detailed = []
-            for msg in messages[:max_results]:
-                detail = await self._get_message(client, headers, msg["id"])
-                detailed.append(detail)
-            return detailed
-
-    async def _get_message(
-        self, client: httpx.AsyncClient, headers: dict, msg_id: str
-    ) -> dict[str, Any]:
-        resp = await client.get(
-            f"{self.BASE_URL}/users/me/messages/{msg_id}",
-            headers=headers,
-            params={"format": "metadata", "metadataHeaders": ["Subject", "From", "Date"]},
+        resp = await self._google._request(
+            "GET",
+            f"{self.BASE_URL}/users/me/messages",
+            params=params,
         )
-        resp.raise_for_status()
-        data = resp.json()
+        messages = orjson.loads(resp.content).get("messages", [])
+
+        ids = [msg["id"] for msg in messages[:max_results]]
+        details = await self._get_messages(ids)
+        return [details[msg_id] for msg_id in ids if msg_id in details]
+
+    async def _get_messages(self, msg_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch metadata for several messages, serving fresh ones from cache.
+
+        Cache misses are fetched through the Gmail batch endpoint, in
+        concurrent batches of up to _BATCH_LIMIT messages.
+        """
+        now = time.time()
+        found: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+        for msg_id in msg_ids:
+            cached = self._message_cache.get(msg_id)
+            if cached and now - cached[1] < _MESSAGE_TTL:
+                found[msg_id] = cached[0]
+            else:
+                missing.append(msg_id)
+
+        if len(missing) == 1:
+            found[missing[0]] = await self._get_message(missing[0])
+        elif missing:
+            chunks = [missing[i:i + _BATCH_LIMIT] for i in range(0, len(missing), _BATCH_LIMIT)]
+            results = await asyncio.gather(
+                *(self._get_messages_batch(chunk) for chunk in chunks)
+            )
+            for result in results:
+                found.update(result)
+
+        for msg_id in missing:
+            if msg_id in found:
+                self._cache_message(msg_id, found[msg_id], now)
+        return found
+
+    async def _get_messages_batch(self, msg_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch metadata for up to _BATCH_LIMIT messages in one batch request."""
+        async with self._fetch_slots:
+            parts = await self._google._batch(GMAIL_BATCH_URL, {
+                msg_id: f"GET /gmail/v1/users/me/messages/{msg_id}?{_METADATA_QUERY}"
+                for msg_id in msg_ids
+            })
+
+        found: dict[str, dict[str, Any]] = {}
+        failed: list[str] = []
+        for msg_id in msg_ids:
+            status, data = parts.get(msg_id, (0, None))
+            if status == 200:
+                found[msg_id] = self._summarize(msg_id, data)
+            else:
+                failed.append(msg_id)
+
+        # Sub-requests can fail individually (e.g. per-user rate limits);
+        # retry those one at a time rather than dropping them.
+        if failed:
+            retries = await asyncio.gather(
+                *(self._get_message(msg_id) for msg_id in failed),
+                return_exceptions=True,
+            )
+            for msg_id, result in zip(failed, retries):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to fetch Gmail message {msg_id}: {result}")
+                else:
+                    found[msg_id] = result
+        return found
+
+    def _cache_message(self, msg_id: str, summary: dict[str, Any], ts: float) -> None:
+        if len(self._message_cache) >= _MESSAGE_CACHE_MAX:
+            # Dicts keep insertion order, so this evicts the oldest entry
+            self._message_cache.pop(next(iter(self._message_cache)))
+        self._message_cache[msg_id] = (summary, ts)
+
+    async def _get_message(self, msg_id: str) -> dict[str, Any]:
+        async with self._fetch_slots:
+            resp = await self._google._request(
+                "GET",
+                f"{self.BASE_URL}/users/me/messages/{msg_id}",
+                params={"format": "metadata", "metadataHeaders": ["Subject", "From", "Date"]},
+            )
+        return self._summarize(msg_id, orjson.loads(resp.content))
 
+    @staticmethod
+    def _summarize(msg_id: str, data: dict[str, Any]) -> dict[str, Any]:
         # Extract headers
         result: dict[str, Any] = {"id": msg_id, "snippet": data.get("snippet", "")}
         for header in data.get("payload", {}).get("headers", []):
@@ -388,35 +879,89 @@ class GoogleGmailService:
         return result
 
     async def read_message(self, msg_id: str) -> dict[str, Any]:
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/users/me/messages/{msg_id}",
-                headers=headers,
-                params={"format": "full"},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        """Fetch a single message in full format (headers, parts and bodies).
+
+        Messages read recently are kept in the local database and served
+        from there until _STORED_MESSAGE_TTL has passed.
+        """
+        stored = await asyncio.to_thread(_load_stored_messages, [msg_id])
+        if msg_id in stored:
+            return stored[msg_id]
+        data = await self._google._get_json(
+            f"{self.BASE_URL}/users/me/messages/{msg_id}", {"format": "full"}
+        )
+        await asyncio.to_thread(_store_messages, [data])
+        return data
+
+    async def read_messages(self, msg_ids: list[str]) -> list[dict[str, Any]]:
+        """Fetch several messages in full format through the Gmail batch endpoint.
+
+        Recently stored messages are not refetched. Results come back in
+        input order; a message that failed is returned as its error body
+        (with an "error" key).
+        """
+        stored = await asyncio.to_thread(_load_stored_messages, msg_ids)
+        missing = [msg_id for msg_id in msg_ids if msg_id not in stored]
+
+        parts: dict[str, tuple[int, Any]] = {}
+        for start in range(0, len(missing), _BATCH_LIMIT):
+            async with self._fetch_slots:
+                parts.update(await self._google._batch(GMAIL_BATCH_URL, {
+                    msg_id: f"GET /gmail/v1/users/me/messages/{msg_id}?format=full"
+                    for msg_id in missing[start:start + _BATCH_LIMIT]
+                }))
+
+        fetched: list[dict[str, Any]] = []
+        for msg_id in missing:
+            status, data = parts.get(msg_id, (0, None))
+            if status == 200:
+                fetched.append(data)
+                stored[msg_id] = data
+            else:
+                logger.warning(f"Batched read of message {msg_id} failed with status {status}")
+                stored[msg_id] = data or {"error": {"code": status}}
+        if fetched:
+            await asyncio.to_thread(_store_messages, fetched)
+        return [stored[msg_id] for msg_id in msg_ids]
+
+    @staticmethod
+    def _encode_message(to: str, subject: str, body: str) -> bytes:
+        """Serialize a plain-text email as RFC 822 bytes.
+
+        Plain ASCII headers go straight into a template; anything needing
+        RFC 2047 encoding (or containing line breaks) goes through EmailMessage.
+        """
+        headers = to + subject
+        if headers.isascii() and "\r" not in headers and "\n" not in headers:
+            return (
+                f"To: {to}\r\n"
+                f"Subject: {subject}\r\n"
+                "MIME-Version: 1.0\r\n"
+                'Content-Type: text/plain; charset="utf-8"\r\n'
+                "Content-Transfer-Encoding: 8bit\r\n"
+                "\r\n"
+                f"{body}"
+            ).encode("utf-8")
+
+        from email.message import EmailMessage
+
+        message = EmailMessage()
+        message["To"] = to
+        message["Subject"] = subject
+        message.set_content(body)
+        return message.as_bytes()
 
     async def send_message(self, to: str, subject: str, body: str) -> dict[str, Any]:
-        import base64
-        from email.mime.text import MIMEText
-
-        message = MIMEText(body)
-        message["to"] = to
-        message["subject"] = subject
-
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-
-        headers = await self._google._get_headers()
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.BASE_URL}/users/me/messages/send",
-                headers=headers,
-                json={"raw": raw},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        # The media upload endpoint takes the RFC 822 bytes as-is, with no
+        # base64/JSON wrapping
+        resp = await self._google._request(
+            "POST",
+            f"{self.UPLOAD_URL}/users/me/messages/send",
+            params={"uploadType": "media"},
+            headers={"Content-Type": "message/rfc822"},
+            content=self._encode_message(to, subject, body),
+        )
+        return orjson.loads(resp.content)
 
     async def search(self, query: str, max_results: int = 10) -> list[dict[str, Any]]:
         return await self.list_messages(query=query, max_results=max_results)
@@ -1,4 +1,4 @@
-"""Market data service — quotes via yfinance, news via RSS (feedparser).
+"""Market data service — quotes via yfinance, news via RSS (fastfeedparser).
 
 Quotes are fetched from Yahoo Finance (no API key required) and cached for
 5 minutes.  News headlines are fetched from configurable RSS feeds and cached
@@ -8,9 +8,11 @@ for 10 minutes.
 import asyncio
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-import feedparser  # type: ignore[import-untyped]
+import fastfeedparser  # type: ignore[import-untyped]
+import httpx
 import yfinance as yf  # type: ignore[import-untyped]
 
 logger = logging.getLogger(__name__)
@@ -37,83 +39,222 @@ DEFAULT_FEEDS: list[str] = [
     "https://feeds.marketwatch.com/marketwatch/topstories",
 ]
 
-_QUOTE_TTL = 300   # 5 minutes
-_NEWS_TTL = 600    # 10 minutes
+# Stale-while-revalidate: entries older than the soft TTL are served while a
+# background refresh runs; only entries past the hard TTL block on upstream.
+_QUOTE_SOFT_TTL = 240   # 4 minutes
+_QUOTE_HARD_TTL = 600   # 10 minutes
+_NEWS_SOFT_TTL = 600    # 10 minutes
+_NEWS_HARD_TTL = 1800   # 30 minutes
+_QUOTE_WORKERS = 16
+_RSS_HEADERS = {"User-Agent": "Mozilla/5.0"}
 
 
 class MarketsService:
     """Singleton-friendly service for market quotes and news."""
 
+    # One connection pool for every MarketsService instance (news feeds)
+    _client: httpx.AsyncClient | None = None
+
     def __init__(self) -> None:
         self._quote_cache: dict[str, tuple[dict[str, Any], float]] = {}
         self._news_cache: tuple[list[dict[str, Any]], float] | None = None
+        # url -> (validator headers, parsed articles) for conditional feed GETs
+        self._feed_cache: dict[str, tuple[dict[str, str], list[dict[str, Any]]]] = {}
+        self._quote_refresh: asyncio.Task[None] | None = None
+        self._news_refresh: asyncio.Task[Any] | None = None
+
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None:
+            cls._client = httpx.AsyncClient(
+                headers=_RSS_HEADERS,
+                timeout=10,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=16),
+            )
+        return cls._client
 
-    def _fetch_quote(self, symbol: str, label: str | None = None) -> dict[str, Any] | None:
-        """Fetch a single quote, returning cached value if fresh."""
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client (called on app shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+    def _cached_quote(
+        self, symbol: str, max_age: float = _QUOTE_HARD_TTL
+    ) -> dict[str, Any] | None:
         cached = self._quote_cache.get(symbol)
         if cached:
             data, ts = cached
-            if time.time() - ts < _QUOTE_TTL:
+            if time.time() - ts < max_age:
                 return data
+        return None
+
+    def _store_quote(
+        self, symbol: str, label: str | None, price: float | None, prev_close: float | None
+    ) -> dict[str, Any] | None:
+        """Build a quote dict from price and previous close and cache it."""
+        if price is None or prev_close is None or prev_close == 0:
+            return None
+        change = round(price - prev_close, 4)
+        change_pct = round((change / prev_close) * 100, 2)
+        data = {
+            "symbol": symbol,
+            "name": label or symbol,
+            "price": round(price, 4),
+            "change": change,
+            "change_pct": change_pct,
+        }
+        self._quote_cache[symbol] = (data, time.time())
+        return data
+
+    def _fetch_quote(
+        self, symbol: str, label: str | None = None, max_age: float = _QUOTE_HARD_TTL
+    ) -> dict[str, Any] | None:
+        """Fetch a single quote, returning cached value if younger than max_age."""
+        cached = self._cached_quote(symbol, max_age)
+        if cached:
+            return cached
 
         try:
-            ticker = yf.Ticker(symbol)
-            fi = ticker.fast_info
-            price: float | None = fi.last_price
-            prev_close: float | None = fi.previous_close
-            if price is None or prev_close is None or prev_close == 0:
-                return None
-            change = round(price - prev_close, 4)
-            change_pct = round((change / prev_close) * 100, 2)
-            data = {
-                "symbol": symbol,
-                "name": label or symbol,
-                "price": round(price, 4),
-                "change": change,
-                "change_pct": change_pct,
-            }
-            self._quote_cache[symbol] = (data, time.time())
-            return data
+            fi = yf.Ticker(symbol).fast_info
+            return self._store_quote(symbol, label, fi.last_price, fi.previous_close)
         except Exception as e:
             logger.debug("Quote fetch failed for %s: %s", symbol, e)
             return None
 
+    def _fetch_quotes_batch(self, labels: dict[str, str | None]) -> None:
+        """Fetch and cache quotes for several symbols with one yfinance download.
+
+        Uses the last two daily closes per symbol; symbols missing from the
+        result are left uncached so the per-symbol path can retry them.
+        """
+        try:
+            data = yf.download(
+                list(labels), period="5d", interval="1d",
+                auto_adjust=False, progress=False, threads=True,
+            )
+        except Exception as e:
+            logger.debug("Batch quote download failed: %s", e)
+            return
+        if data is None or data.empty:
+            return
+
+        closes = data["Close"]
+        if closes.ndim == 1:  # older yfinance returns a Series for one symbol
+            closes = closes.to_frame(next(iter(labels)))
+        for symbol in closes.columns:
+            # Markets keep different calendars (crypto trades weekends), so
+            # drop each symbol's own gaps before taking its last two closes
+            series = closes[symbol].dropna()
+            if len(series) >= 2 and symbol in labels:
+                self._store_quote(
+                    symbol, labels[symbol], float(series.iloc[-1]), float(series.iloc[-2])
+                )
+
+    @staticmethod
+    def _groups(watchlist: list[str]) -> dict[str, list[tuple[str, str | None]]]:
+        return {
+            "indexes": list(INDEXES),
+            "macro": list(MACRO),
+            "watchlist": [(sym, None) for sym in watchlist],
+        }
+
+    def _fetch_quotes(self, labels: dict[str, str | None], max_age: float) -> None:
+        """Populate the cache for every symbol older than max_age."""
+        stale = {
+            sym: label for sym, label in labels.items() if not self._cached_quote(sym, max_age)
+        }
+        if len(stale) > 1:
+            self._fetch_quotes_batch(stale)
+
+        # Anything the batch missed is fetched per symbol, concurrently
+        with ThreadPoolExecutor(max_workers=_QUOTE_WORKERS) as pool:
+            for sym, label in stale.items():
+                pool.submit(self._fetch_quote, sym, label, max_age)
+
     def _fetch_snapshot(self, watchlist: list[str]) -> dict[str, list[dict[str, Any]]]:
-        indexes = [q for sym, name in INDEXES if (q := self._fetch_quote(sym, name))]
-        macro = [q for sym, name in MACRO if (q := self._fetch_quote(sym, name))]
-        watch = [q for sym in watchlist if (q := self._fetch_quote(sym))]
-        return {"indexes": indexes, "macro": macro, "watchlist": watch}
+        groups = self._groups(watchlist)
+        labels: dict[str, str | None] = {}
+        for pairs in groups.values():
+            for sym, label in pairs:
+                labels.setdefault(sym, label)
+        self._fetch_quotes(labels, _QUOTE_HARD_TTL)
+        return {
+            group: [q for sym, _ in pairs if (q := self._cached_quote(sym))]
+            for group, pairs in groups.items()
+        }
 
     async def get_snapshot(self, watchlist: list[str]) -> dict[str, Any]:
-        return await asyncio.to_thread(self._fetch_snapshot, watchlist)
+        snapshot = await asyncio.to_thread(self._fetch_snapshot, watchlist)
+
+        # Quotes past the soft TTL were served from cache; refresh them behind the response
+        soft_stale = {
+            sym: label
+            for pairs in self._groups(watchlist).values()
+            for sym, label in pairs
+            if not self._cached_quote(sym, _QUOTE_SOFT_TTL)
+        }
+        if soft_stale and (self._quote_refresh is None or self._quote_refresh.done()):
+            self._quote_refresh = asyncio.create_task(
+                asyncio.to_thread(self._fetch_quotes, soft_stale, _QUOTE_SOFT_TTL)
+            )
+        return snapshot
+
+    async def _fetch_feed(self, url: str) -> list[dict[str, Any]]:
+        cached = self._feed_cache.get(url)
+        resp = await self._get_client().get(url, headers=cached[0] if cached else None)
+        if resp.status_code == 304 and cached:
+            return cached[1]
+        resp.raise_for_status()
+        feed = fastfeedparser.parse(resp.content)
+        source = feed.feed.get("title", url)
+        articles: list[dict[str, Any]] = []
+        for entry in feed.entries[:5]:
+            title = entry.get("title", "").strip()
+            link = entry.get("link", "")
+            if title and link:
+                articles.append({
+                    "title": title,
+                    "url": link,
+                    "source": source,
+                    "published": entry.get("published", ""),
+                })
+
+        validators: dict[str, str] = {}
+        if etag := resp.headers.get("ETag"):
+            validators["If-None-Match"] = etag
+        if modified := resp.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = modified
+        if validators:
+            self._feed_cache[url] = (validators, articles)
+        return articles
 
-    def _fetch_news(self, feeds: list[str]) -> list[dict[str, Any]]:
+    async def get_news(self, feeds: list[str]) -> list[dict[str, Any]]:
         if self._news_cache:
             articles, ts = self._news_cache
-            if time.time() - ts < _NEWS_TTL:
+            age = time.time() - ts
+            if age < _NEWS_SOFT_TTL:
+                return articles
+            if age < _NEWS_HARD_TTL:
+                if self._news_refresh is None or self._news_refresh.done():
+                    self._news_refresh = asyncio.create_task(self._fetch_news(feeds))
                 return articles
+        return await self._fetch_news(feeds)
 
-        articles: list[dict[str, Any]] = []
-        for url in feeds:
-            try:
-                feed = feedparser.parse(url, request_headers={"User-Agent": "Mozilla/5.0"})
-                source = feed.feed.get("title", url)
-                for entry in feed.entries[:5]:
-                    title = entry.get("title", "").strip()
-                    link = entry.get("link", "")
-                    if title and link:
-                        articles.append({
-                            "title": title,
-                            "url": link,
-                            "source": source,
-                            "published": entry.get("published", ""),
-                        })
-            except Exception as e:
-                logger.debug("News feed failed for %s: %s", url, e)
+    async def _fetch_news(self, feeds: list[str]) -> list[dict[str, Any]]:
+        # Feeds are fetched concurrently; a failing feed just contributes nothing
+        results = await asyncio.gather(
+            *(self._fetch_feed(url) for url in feeds), return_exceptions=True
+        )
+        articles = []
+        for url, result in zip(feeds, results):
+            if isinstance(result, BaseException):
+                logger.debug("News feed failed for %s: %s", url, result)
+                continue
+            articles.extend(result)
 
         articles = articles[:20]
         self._news_cache = (articles, time.time())
         return articles
-
-    async def get_news(self, feeds: list[str]) -> list[dict[str, Any]]:
-        return await asyncio.to_thread(self._fetch_news, feeds)
@@ -10,35 +10,84 @@ inside the request body, bypassing this entirely.  We use:
 
 import asyncio
 import base64
+import functools
+import hashlib
 import io
 import logging
+import math
+import threading
+import time
 import xmlrpc.client
+from collections.abc import Callable
 from typing import Any
 
 import httpx
 from PIL import Image
 
+try:
+    import pyvips  # type: ignore[import-untyped]
+except (ImportError, OSError):  # OSError: pyvips installed but libvips missing
+    pyvips = None
+
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 MAX_IMAGE_BYTES = 100_000  # 100 KB
+_WEBP_CACHE_MAX = 32  # recent conversions kept for repeated uploads
+_TERM_CACHE_TTL = 300  # 5 minutes
+_TERM_CACHE_MAX = 512
 
 
 class WordPressService:
     """WordPress client — REST API for reads, XML-RPC for authenticated writes."""
 
+    # One REST connection pool for every WordPressService instance; the site
+    # URL is fixed for the lifetime of the process.
+    _client: httpx.AsyncClient | None = None
+    # ServerProxy isn't safe to share between threads, so each to_thread worker
+    # keeps its own proxy (and with it a kept-alive XML-RPC connection).
+    _xmlrpc_local = threading.local()
+    # Recent WebP conversions keyed by a hash of the source bytes, so retrying
+    # a failed upload of the same photo skips the resize/encode work. Guarded
+    # by a lock because conversions run in worker threads.
+    _webp_cache: dict[bytes, tuple[bytes, str]] = {}
+    _webp_lock = threading.Lock()
+    # Tag/category IDs by (taxonomy, lowercased name), so repeat posts to the
+    # same terms skip the listing round trips.
+    _term_cache: dict[tuple[str, str], tuple[int, float]] = {}
+
     def __init__(self) -> None:
         self._url = settings.wordpress_url.rstrip("/")
         self._username = settings.wordpress_username
         self._app_password = settings.wordpress_app_password
+        self._base_url = f"{self._url}/wp-json/wp/v2"
+        self._auth_header: dict[str, str] | None = None
 
     @property
     def is_configured(self) -> bool:
         return bool(self._url and self._username and self._app_password)
 
     def _base(self) -> str:
-        return f"{self._url}/wp-json/wp/v2"
+        return self._base_url
+
+    def _get_client(self) -> httpx.AsyncClient:
+        client = WordPressService._client
+        if client is None:
+            client = WordPressService._client = httpx.AsyncClient(
+                base_url=self._base(),
+                http2=True,
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=20),
+            )
+        return client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client (called on app shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
 
     def _headers(self) -> dict[str, str]:
         if not self.is_configured:
@@ -46,15 +95,21 @@ class WordPressService:
                 "WordPress not configured. Set ASSISTANT_WORDPRESS_URL, "
                 "ASSISTANT_WORDPRESS_USERNAME, and ASSISTANT_WORDPRESS_APP_PASSWORD."
             )
-        token = base64.b64encode(
-            f"{self._username}:{self._app_password}".encode()
-        ).decode()
-        return {"Authorization": f"Basic {token}"}
+        if self._auth_header is None:
+            token = base64.b64encode(
+                f"{self._username}:{self._app_password}".encode()
+            ).decode()
+            self._auth_header = {"Authorization": f"Basic {token}"}
+        return self._auth_header
 
     def _xmlrpc(self) -> xmlrpc.client.ServerProxy:
-        return xmlrpc.client.ServerProxy(
-            f"{self._url}/xmlrpc.php", use_datetime=True
-        )
+        local = WordPressService._xmlrpc_local
+        proxy = getattr(local, "proxy", None)
+        if proxy is None:
+            proxy = local.proxy = xmlrpc.client.ServerProxy(
+                f"{self._url}/xmlrpc.php", use_datetime=True
+            )
+        return proxy
 
     def _xmlrpc_call(self, method: str, *args: Any) -> Any:
         """Synchronous XML-RPC call (run via asyncio.to_thread)."""
@@ -101,14 +156,13 @@ class WordPressService:
 
     async def _list_posts_rest(self, per_page: int = 10) -> list[dict[str, Any]]:
         """Fallback: list published posts via REST (no auth needed)."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self._base()}/posts",
-                params={"per_page": per_page, "status": "publish"},
-                timeout=15.0,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get_client().get(
+            "/posts",
+            params={"per_page": per_page, "status": "publish"},
+            timeout=15.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def get_post(self, post_id: int) -> dict[str, Any]:
         try:
@@ -122,13 +176,9 @@ class WordPressService:
             return self._xmlrpc_post_to_rest(post)
         except xmlrpc.client.Fault:
             # Fallback: REST (works for published posts)
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(
-                    f"{self._base()}/posts/{post_id}",
-                    timeout=10.0,
-                )
-                resp.raise_for_status()
-                return resp.json()
+            resp = await self._get_client().get(f"/posts/{post_id}")
+            resp.raise_for_status()
+            return resp.json()
 
     async def create_post(
         self,
@@ -222,17 +272,24 @@ class WordPressService:
     @staticmethod
     def _xmlrpc_post_to_rest(p: dict) -> dict[str, Any]:
         """Convert XML-RPC post dict to the REST-API-like shape the frontend expects."""
-        terms = p.get("terms", [])
-        cat_ids = [t["term_id"] for t in terms if t.get("taxonomy") == "category"]
-        tag_ids = [t["term_id"] for t in terms if t.get("taxonomy") == "post_tag"]
+        cat_ids: list[int] = []
+        tag_ids: list[int] = []
+        for t in p.get("terms", []):
+            taxonomy = t.get("taxonomy")
+            if taxonomy == "category":
+                cat_ids.append(t["term_id"])
+            elif taxonomy == "post_tag":
+                tag_ids.append(t["term_id"])
 
         # Extract custom privacy meta
-        custom_fields = p.get("custom_fields", [])
-        privacy_level = "public"
-        for cf in custom_fields:
-            if cf.get("key") == "_privacy_level" and cf.get("value"):
-                privacy_level = cf["value"]
-                break
+        privacy_level = next(
+            (
+                cf["value"]
+                for cf in p.get("custom_fields", [])
+                if cf.get("key") == "_privacy_level" and cf.get("value")
+            ),
+            "public",
+        )
 
         return {
             "id": int(p.get("post_id", 0)),
@@ -285,43 +342,140 @@ class WordPressService:
 
     async def list_media(self, per_page: int = 10) -> list[dict[str, Any]]:
         """List media (public REST endpoint, no auth needed)."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self._base()}/media",
-                params={"per_page": per_page},
-                timeout=10.0,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get_client().get(
+            "/media",
+            params={"per_page": per_page},
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     # ------------------------------------------------------------------
     # Image processing
     # ------------------------------------------------------------------
 
-    def _process_image(self, data: bytes) -> tuple[bytes, str]:
-        """Convert image to WebP, resizing until under 100 KB."""
-        img = Image.open(io.BytesIO(data))
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
+    @staticmethod
+    def _fit_webp(
+        img: Any,
+        width: int,
+        height: int,
+        encode: Callable[[Any, int], bytes],
+        resize: Callable[[Any, int, int], Any],
+    ) -> bytes:
+        """Encode img as WebP under MAX_IMAGE_BYTES using the given backend ops."""
+        webp_bytes = encode(img, 80)
+        if len(webp_bytes) <= MAX_IMAGE_BYTES:
+            return webp_bytes
+
+        # Encoded size scales roughly with pixel count, so one resize of the
+        # original gets close to the budget; a slight undershoot leaves room.
+        full_size = len(webp_bytes)
+        scale = math.sqrt(MAX_IMAGE_BYTES / full_size) * 0.95
+        resized = resize(img, max(int(width * scale), 10), max(int(height * scale), 10))
+        webp_bytes = encode(resized, 80)
+        if len(webp_bytes) < MAX_IMAGE_BYTES // 2:
+            return WordPressService._refit_scale(
+                img, width, height, encode, resize, (1.0, full_size), (scale, webp_bytes)
+            )
+        if len(webp_bytes) <= MAX_IMAGE_BYTES:
+            return webp_bytes
+        img = resized
+
+        # Still over: binary-search the highest quality that fits
+        best: bytes | None = None
+        lo, hi = 30, 79
+        for _ in range(3):
+            quality = (lo + hi) // 2
+            candidate = encode(img, quality)
+            if len(candidate) <= MAX_IMAGE_BYTES:
+                best, lo = candidate, quality + 1
+            else:
+                webp_bytes, hi = candidate, quality - 1
+        if best is None:
+            # Return whatever we have
+            best = min(webp_bytes, encode(img, 30), key=len)
+        return best
 
-        quality = 80
-        for _ in range(10):
-            buf = io.BytesIO()
-            img.save(buf, format="WEBP", quality=quality)
-            webp_bytes = buf.getvalue()
-            if len(webp_bytes) <= MAX_IMAGE_BYTES:
-                return webp_bytes, "image.webp"
-            # Reduce dimensions by 75%
-            new_w = int(img.width * 0.75)
-            new_h = int(img.height * 0.75)
-            if new_w < 10 or new_h < 10:
+    @staticmethod
+    def _refit_scale(
+        img: Any,
+        width: int,
+        height: int,
+        encode: Callable[[Any, int], bytes],
+        resize: Callable[[Any, int, int], Any],
+        over: tuple[float, int],
+        fit: tuple[float, bytes],
+    ) -> bytes:
+        """Grow a resize that landed far under budget back towards it.
+
+        High-entropy images shrink faster than their pixel count, so the
+        scale is re-estimated on a size ~ scale**k curve through the closest
+        fitting encode and the closest one over budget.
+        """
+        for _ in range(2):
+            size = len(fit[1])
+            if size >= MAX_IMAGE_BYTES // 2:
                 break
-            img = img.resize((new_w, new_h), Image.LANCZOS)
+            k = math.log(over[1] / size) / math.log(over[0] / fit[0])
+            scale = fit[0] * (MAX_IMAGE_BYTES * 0.9 / size) ** (1 / k)
+            candidate = encode(
+                resize(img, max(int(width * scale), 10), max(int(height * scale), 10)), 80
+            )
+            if len(candidate) <= MAX_IMAGE_BYTES:
+                fit = (scale, candidate)
+            else:
+                over = (scale, len(candidate))
+        return fit[1]
 
-        # Return whatever we have
+    @staticmethod
+    def _pil_encode(img: Image.Image, quality: int) -> bytes:
         buf = io.BytesIO()
-        img.save(buf, format="WEBP", quality=60)
-        return buf.getvalue(), "image.webp"
+        img.save(buf, format="WEBP", quality=quality)
+        return buf.getvalue()
+
+    def _process_image(self, data: bytes) -> tuple[bytes, str]:
+        """Convert image to WebP, resizing until under 100 KB.
+
+        Repeat conversions of the same bytes are served from a small cache.
+        """
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        cache = WordPressService._webp_cache
+        with WordPressService._webp_lock:
+            cached = cache.get(digest)
+        if cached:
+            return cached
+        converted = self._convert_image(data)
+        with WordPressService._webp_lock:
+            if len(cache) >= _WEBP_CACHE_MAX:
+                cache.pop(next(iter(cache)))
+            cache[digest] = converted
+        return converted
+
+    def _convert_image(self, data: bytes) -> tuple[bytes, str]:
+        """Encode with libvips when pyvips is installed (faster, lower memory), else PIL."""
+        if pyvips is not None:
+            img = pyvips.Image.new_from_buffer(data, "")
+            if img.hasalpha():
+                img = img.extract_band(0, n=img.bands - 1)
+            webp_bytes = self._fit_webp(
+                img,
+                img.width,
+                img.height,
+                lambda im, q: im.webpsave_buffer(Q=q),
+                lambda im, w, h: im.thumbnail_image(w, height=h),
+            )
+            return webp_bytes, "image.webp"
+
+        img = Image.open(io.BytesIO(data))
+        if img.mode in ("RGBA", "P"):
+            img = img.convert("RGB")
+        webp_bytes = self._fit_webp(
+            img,
+            img.width,
+            img.height,
+            self._pil_encode,
+            lambda im, w, h: im.resize((w, h), Image.LANCZOS),
+        )
+        return webp_bytes, "image.webp"
 
     # ------------------------------------------------------------------
     # Tags & Categories (public REST reads + XML-RPC for creates)
@@ -333,75 +487,116 @@ class WordPressService:
         params: dict[str, Any] = {"per_page": per_page}
         if search:
             params["search"] = search
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self._base()}/tags",
-                params=params,
-                timeout=10.0,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get_client().get(
+            "/tags",
+            params=params,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def list_categories(self, per_page: int = 100) -> list[dict[str, Any]]:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self._base()}/categories",
-                params={"per_page": per_page},
-                timeout=10.0,
+        resp = await self._get_client().get(
+            "/categories",
+            params={"per_page": per_page},
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def _xmlrpc_multicall(self, calls: list[tuple[str, tuple[Any, ...]]]) -> list[Any]:
+        """Synchronous system.multicall — one round trip for several calls."""
+        multi = xmlrpc.client.MultiCall(self._xmlrpc())
+        for method, args in calls:
+            getattr(multi, method)(*args)
+        # Iterating raises the first xmlrpc.client.Fault, like a single call would
+        return list(multi())
+
+    async def _create_terms(self, taxonomy: str, names: list[str]) -> list[int]:
+        """Create several terms via one XML-RPC multicall, returning their IDs."""
+        if not names:
+            return []
+        calls = [
+            (
+                "wp.newTerm",
+                (0, self._username, self._app_password, {"taxonomy": taxonomy, "name": name}),
             )
-            resp.raise_for_status()
-            return resp.json()
+            for name in names
+        ]
+        results = await asyncio.to_thread(self._xmlrpc_multicall, calls)
+        return [int(term_id) for term_id in results]
 
-    async def get_or_create_tags(self, names: list[str]) -> list[int]:
-        """Resolve tag names to IDs, creating via XML-RPC if needed."""
-        ids: list[int] = []
+    @staticmethod
+    def _clean_names(names: list[str]) -> list[str]:
+        """Strip names and drop blanks and case-insensitive duplicates."""
+        seen: set[str] = set()
+        cleaned: list[str] = []
         for name in names:
             name = name.strip()
-            if not name:
-                continue
-            existing = await self.list_tags(search=name, per_page=10)
-            found = next(
-                (t for t in existing if t.get("name", "").lower() == name.lower()),
-                None,
-            )
-            if found:
-                ids.append(found["id"])
-            else:
-                # Create via XML-RPC
-                term_id = await self._call(
-                    "wp.newTerm",
-                    0,
-                    self._username,
-                    self._app_password,
-                    {"taxonomy": "post_tag", "name": name},
-                )
-                ids.append(int(term_id))
+            if name and name.lower() not in seen:
+                seen.add(name.lower())
+                cleaned.append(name)
+        return cleaned
+
+    @staticmethod
+    def _cached_term_ids(taxonomy: str, names: list[str]) -> list[int] | None:
+        """Return IDs for all names from the term cache, or None on any miss."""
+        now = time.time()
+        ids: list[int] = []
+        for name in names:
+            cached = WordPressService._term_cache.get((taxonomy, name.lower()))
+            if not cached or now - cached[1] >= _TERM_CACHE_TTL:
+                return None
+            ids.append(cached[0])
         return ids
 
+    async def _resolve_terms(
+        self, taxonomy: str, names: list[str], term_map: dict[str, int]
+    ) -> list[int]:
+        """Map names to IDs via term_map, creating the missing ones in one batch."""
+        names = self._clean_names(names)
+        missing = [n for n in names if n.lower() not in term_map]
+        for name, term_id in zip(missing, await self._create_terms(taxonomy, missing)):
+            term_map[name.lower()] = term_id
+
+        cache = WordPressService._term_cache
+        now = time.time()
+        for name in names:
+            if len(cache) >= _TERM_CACHE_MAX:
+                cache.pop(next(iter(cache)))
+            cache[(taxonomy, name.lower())] = (term_map[name.lower()], now)
+        return [term_map[n.lower()] for n in names]
+
+    async def get_or_create_tags(self, names: list[str]) -> list[int]:
+        """Resolve tag names to IDs, creating via XML-RPC if needed."""
+        names = self._clean_names(names)
+        if not names:
+            return []
+        if (cached := self._cached_term_ids("post_tag", names)) is not None:
+            return cached
+        all_tags = await self.list_tags(per_page=100)
+        tag_map = {t["name"].lower(): t["id"] for t in all_tags}
+
+        # A full page means the site may have more tags than one listing
+        # returns; search for whatever is still unmatched before creating it.
+        missing = [n for n in names if n.lower() not in tag_map]
+        if missing and len(all_tags) >= 100:
+            found = await asyncio.gather(
+                *(self.list_tags(search=n, per_page=10) for n in missing)
+            )
+            for tags in found:
+                tag_map.update((t["name"].lower(), t["id"]) for t in tags)
+
+        return await self._resolve_terms("post_tag", names, tag_map)
+
     async def get_or_create_categories(self, names: list[str]) -> list[int]:
         """Resolve category names to IDs, creating via XML-RPC if needed."""
+        names = self._clean_names(names)
+        if not names:
+            return []
+        if (cached := self._cached_term_ids("category", names)) is not None:
+            return cached
         all_cats = await self.list_categories()
         cat_map = {c["name"].lower(): c["id"] for c in all_cats}
-
-        ids: list[int] = []
-        for name in names:
-            name = name.strip()
-            if not name:
-                continue
-            if name.lower() in cat_map:
-                ids.append(cat_map[name.lower()])
-            else:
-                term_id = await self._call(
-                    "wp.newTerm",
-                    0,
-                    self._username,
-                    self._app_password,
-                    {"taxonomy": "category", "name": name},
-                )
-                new_id = int(term_id)
-                ids.append(new_id)
-                cat_map[name.lower()] = new_id
-        return ids
+        return await self._resolve_terms("category", names, cat_map)
 
     # ------------------------------------------------------------------
     # Diagnostics
@@ -446,3 +641,9 @@ class WordPressService:
                     "Generate a new one if needed. Also check that XML-RPC is not "
                     "blocked by a security plugin.",
         }
+
+
+@functools.cache
+def get_wordpress() -> WordPressService:
+    """Return the process-wide WordPressService, created on first use."""
+    return WordPressService()
@@ -3,19 +3,25 @@
 from typing import AsyncIterator
 
 from google import genai
+from google.genai import types
 
 from app.core.config import settings
 from app.services.llm.base import BaseLLMProvider, LLMResponse, Message
 
 
+def _to_gemini_contents(messages: list[Message]) -> list[types.Content]:
+    """Build typed Content objects so the SDK doesn't re-coerce plain dicts."""
+    return [types.Content(role=m.role, parts=[types.Part(text=m.content)]) for m in messages]
+
+
 class GeminiProvider(BaseLLMProvider):
     def __init__(self):
         self.client = genai.Client(api_key=settings.gemini_api_key)
         self.model = "gemini-2.0-flash"
 
     async def chat(self, messages: list[Message], tools: list[dict] | None = None) -> LLMResponse:
-        contents = [{"role": m.role, "parts": [{"text": m.content}]} for m in messages]
-        response = self.client.models.generate_content(
+        contents = _to_gemini_contents(messages)
+        response = await self.client.aio.models.generate_content(
             model=self.model,
             contents=contents,
         )
@@ -24,11 +30,11 @@ class GeminiProvider(BaseLLMProvider):
     async def chat_stream(
         self, messages: list[Message], tools: list[dict] | None = None
     ) -> AsyncIterator[str]:
-        contents = [{"role": m.role, "parts": [{"text": m.content}]} for m in messages]
-        response = self.client.models.generate_content_stream(
+        contents = _to_gemini_contents(messages)
+        response = await self.client.aio.models.generate_content_stream(
             model=self.model,
             contents=contents,
         )
-        for chunk in response:
+        async for chunk in response:
             if chunk.text:
                 yield chunk.text
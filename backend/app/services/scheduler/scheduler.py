@@ -1,10 +1,12 @@
 """Background scheduler that runs scheduled actions via cron expressions."""
 
 import asyncio
+import functools
 import logging
+import time
 from datetime import datetime, timezone
 
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select, update
 
 from app.core.database import engine
 from app.models.schedule import ScheduledAction, ScheduledRun
@@ -15,48 +17,100 @@ logger = logging.getLogger(__name__)
 # Rate limit: max scheduled runs per hour
 MAX_RUNS_PER_HOUR = 30
 
+# Enabled actions, reloaded at most once per TTL or after a schedule changes
+_ACTIONS_TTL = 60
+_actions_cache: tuple[list[ScheduledAction], float] | None = None
+
+
+# (low, high) bounds for minute, hour, day of month, month, day of week
+_CRON_BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _parse_cron_field(pattern: str, low: int, high: int) -> frozenset[int] | None:
+    """Expand one cron field into its allowed values (None means any)."""
+    if pattern == "*":
+        return None
+    values: set[int] = set()
+    for part in pattern.split(","):
+        base, _, step_str = part.partition("/")
+        step = int(step_str) if step_str else 1
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start_str, end_str = base.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(base)
+            # "5/15" means every 15 starting at 5
+            end = high if step_str else start
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"Invalid cron field: {pattern}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_cron(cron_expr: str) -> tuple[frozenset[int] | None, ...] | None:
+    """Parse a cron expression once; returns None if it is invalid."""
+    parts = cron_expr.strip().split()
+    if len(parts) != 5:
+        return None
+    try:
+        fields = [
+            _parse_cron_field(pattern, low, high)
+            for pattern, (low, high) in zip(parts, _CRON_BOUNDS)
+        ]
+    except ValueError:
+        return None
+    dow = fields[4]
+    if dow is not None and 7 in dow:
+        fields[4] = (dow - {7}) | {0}  # 7 is also Sunday
+    return tuple(fields)
+
 
 def _cron_matches_now(cron_expr: str, now: datetime) -> bool:
     """Simple cron matcher for: minute hour day_of_month month day_of_week.
 
-    Supports * (any) and specific values. Does not support ranges or steps.
+    Supports * (any), specific values, lists, ranges (a-b) and steps (*/n, a-b/n).
     """
-    parts = cron_expr.strip().split()
-    if len(parts) != 5:
+    fields = _parse_cron(cron_expr)
+    if fields is None:
         return False
 
-    fields = [
-        (parts[0], now.minute),
-        (parts[1], now.hour),
-        (parts[2], now.day),
-        (parts[3], now.month),
-        (parts[4], now.isoweekday() % 7),  # 0=Sun
-    ]
-
-    for pattern, value in fields:
-        if pattern == "*":
-            continue
-        try:
-            if "," in pattern:
-                if value not in [int(p) for p in pattern.split(",")]:
-                    return False
-            elif int(pattern) != value:
-                return False
-        except ValueError:
-            return False
+    values = (now.minute, now.hour, now.day, now.month, now.isoweekday() % 7)  # 0=Sun
+    return all(
+        allowed is None or value in allowed for allowed, value in zip(fields, values)
+    )
+
+
+def invalidate_actions_cache() -> None:
+    """Drop the cached action list (call after creating/updating/deleting schedules)."""
+    global _actions_cache
+    _actions_cache = None
+
+
+def _enabled_actions(session: Session) -> list[ScheduledAction]:
+    global _actions_cache
+    if _actions_cache:
+        actions, ts = _actions_cache
+        if time.time() - ts < _ACTIONS_TTL:
+            return actions
 
-    return True
+    actions = list(session.exec(
+        select(ScheduledAction).where(ScheduledAction.enabled == True)  # noqa: E712
+    ).all())
+    _actions_cache = (actions, time.time())
+    return actions
 
 
-def _count_recent_runs(session: Session, hours: int = 1) -> int:
+def _count_recent_runs(session: Session, hours: int = 1, now: datetime | None = None) -> int:
     """Count runs in the last N hours for rate limiting."""
-    cutoff = datetime.now(timezone.utc).replace(
+    cutoff = (now or datetime.now(timezone.utc)).replace(
         minute=0, second=0, microsecond=0
     )
-    runs = session.exec(
-        select(ScheduledRun).where(ScheduledRun.started_at >= cutoff)
-    ).all()
-    return len(runs)
+    return session.exec(
+        select(func.count()).select_from(ScheduledRun).where(ScheduledRun.started_at >= cutoff)
+    ).one()
 
 
 async def _execute_scheduled_action(action: ScheduledAction) -> None:
@@ -72,31 +126,43 @@ async def _execute_scheduled_action(action: ScheduledAction) -> None:
     messages = [{"role": "user", "parts": [{"text": action.prompt}]}]
 
     try:
-        full_response = ""
+        # Only the first 5000 characters are stored, but the agent still
+        # runs to completion so any tool calls it makes are carried out.
+        parts: list[str] = []
+        length = 0
         async for token in agent.run(messages):
-            full_response += token
+            if length < 5000:
+                parts.append(token)
+                length += len(token)
+        full_response = "".join(parts)
 
         with Session(engine) as session:
-            run = session.get(ScheduledRun, run_id)
-            if run:
-                run.status = "success"
-                run.result = full_response[:5000]  # Truncate if very long
-                run.finished_at = datetime.now(timezone.utc)
-                session.add(run)
-                session.commit()
+            session.exec(
+                update(ScheduledRun)
+                .where(ScheduledRun.id == run_id)
+                .values(
+                    status="success",
+                    result=full_response[:5000],  # Truncate if very long
+                    finished_at=datetime.now(timezone.utc),
+                )
+            )
+            session.commit()
 
         logger.info(f"Scheduled action '{action.name}' completed successfully")
 
     except Exception as e:
         logger.error(f"Scheduled action '{action.name}' failed: {e}")
         with Session(engine) as session:
-            run = session.get(ScheduledRun, run_id)
-            if run:
-                run.status = "failed"
-                run.error = str(e)[:1000]
-                run.finished_at = datetime.now(timezone.utc)
-                session.add(run)
-                session.commit()
+            session.exec(
+                update(ScheduledRun)
+                .where(ScheduledRun.id == run_id)
+                .values(
+                    status="failed",
+                    error=str(e)[:1000],
+                    finished_at=datetime.now(timezone.utc),
+                )
+            )
+            session.commit()
 
 
 async def _check_weekly_summary(now: datetime) -> None:
@@ -124,16 +190,13 @@ async def scheduler_loop() -> None:
 
             with Session(engine) as session:
                 # Rate limit check
-                recent_count = _count_recent_runs(session)
+                recent_count = _count_recent_runs(session, now=now)
                 if recent_count >= MAX_RUNS_PER_HOUR:
                     logger.warning(f"Rate limit reached ({recent_count} runs this hour), skipping")
                     await asyncio.sleep(60)
                     continue
 
-                # Get enabled actions
-                actions = session.exec(
-                    select(ScheduledAction).where(ScheduledAction.enabled == True)  # noqa: E712
-                ).all()
+                actions = _enabled_actions(session)
 
             for action in actions:
                 if _cron_matches_now(action.cron_expression, now):
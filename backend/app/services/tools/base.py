@@ -19,9 +19,12 @@ class ToolDefinition:
     name: str
     description: str
     parameters: list[ToolParameter] = field(default_factory=list)
+    _schema: dict | None = field(default=None, init=False, repr=False, compare=False)
 
     def to_gemini_schema(self) -> dict:
-        """Convert to Gemini function declaration format."""
+        """Convert to Gemini function declaration format (built once per definition)."""
+        if self._schema is not None:
+            return self._schema
         properties = {}
         required = []
         for param in self.parameters:
@@ -32,7 +35,7 @@ class ToolDefinition:
             if param.required:
                 required.append(param.name)
 
-        return {
+        self._schema = {
             "name": self.name,
             "description": self.description,
             "parameters": {
@@ -41,6 +44,7 @@ class ToolDefinition:
                 "required": required,
             },
         }
+        return self._schema
 
 
 class BaseTool(ABC):
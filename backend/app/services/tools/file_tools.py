@@ -1,20 +1,218 @@
 """Sandboxed file operation tools for the agent."""
 
+import asyncio
+import io
+import os
+import shutil
+from itertools import islice
+from pathlib import Path
 from typing import Any
 
 from app.core.sandbox import SandboxError, resolve_sandboxed_path
 from app.services.tools.base import BaseTool, ToolDefinition, ToolParameter
 
+MAX_READ_CHARS = 1_048_576
+_MAX_SEARCH_RESULTS = 20
+_MAX_LINE_MATCHES = 5  # per file
+_RG_TIMEOUT = 10
+# Longer matching lines are shortened by rg itself; the stream limit only has
+# to cover the path plus that preview.
+_RG_MAX_COLUMNS = 500
+_RG_LINE_LIMIT = 1 << 20
+
+# Content search never reads files with these suffixes, and sniffs the first
+# _SNIFF_BYTES of everything else for a NUL before loading the rest.
+_BINARY_SUFFIXES = frozenset({
+    ".7z", ".bin", ".bz2", ".dll", ".dylib", ".exe", ".gif", ".gz", ".ico", ".jpeg",
+    ".jpg", ".mov", ".mp3", ".mp4", ".parquet", ".pdf", ".png", ".so", ".tar", ".webp",
+    ".woff", ".woff2", ".xz", ".zip",
+})
+_SNIFF_BYTES = 512
+
+
+def _format_matches(rel: str, matches: list[str]) -> str:
+    return f"{rel}\n" + "\n".join(matches)
+
+
+async def _rg_content_search(base: Path, root: Path, query: str) -> list[str] | None:
+    """Case-insensitive literal content search via ripgrep.
+
+    Returns results in the same shape as the Python fallback, or None when
+    ``rg`` isn't installed or its output can't be read (the caller then
+    falls back to the Python walk).
+    """
+    rg = shutil.which("rg")
+    if rg is None:
+        return None
+
+    proc = await asyncio.create_subprocess_exec(
+        rg, "--fixed-strings", "--ignore-case", "--line-number", "--with-filename",
+        "--null", "--no-heading", "--color=never",
+        # Search everything the Python walk would (no .gitignore / hidden skipping)
+        "--hidden", "--no-ignore", "--sort=path",
+        f"--max-count={_MAX_LINE_MATCHES}", "--max-filesize=10M",
+        f"--max-columns={_RG_MAX_COLUMNS}", "--max-columns-preview",
+        "--", query, str(base),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        limit=_RG_LINE_LIMIT,
+    )
+    assert proc.stdout is not None
+    root_prefix = f"{root}/"
+    results: list[str] = []
+    current: str | None = None
+    matches: list[str] = []
+    timed_out = False
+    try:
+        async with asyncio.timeout(_RG_TIMEOUT):
+            # Output lines are "path\0lineno:text"
+            async for raw in proc.stdout:
+                path, _, rest = raw.decode(errors="replace").rstrip("\n").partition("\0")
+                lineno, _, text = rest.partition(":")
+                if path != current:
+                    if current is not None:
+                        results.append(_format_matches(current.removeprefix(root_prefix), matches))
+                        if len(results) >= _MAX_SEARCH_RESULTS:
+                            results.append("... (truncated, too many results)")
+                            return results
+                    current, matches = path, []
+                matches.append(f"  L{lineno}: {text.strip()}")
+    except TimeoutError:
+        timed_out = True
+    except ValueError:
+        # An output line over the stream limit
+        return None
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+
+    if current is not None and len(results) < _MAX_SEARCH_RESULTS:
+        results.append(_format_matches(current.removeprefix(root_prefix), matches))
+    if timed_out:
+        results.append("... (search timed out, results incomplete)")
+    return results
+
+
+def _read_bounded(file_path: Path) -> str:
+    # Bounded read so a huge file can't be pulled into memory whole
+    with file_path.open(encoding="utf-8") as f:
+        content = f.read(MAX_READ_CHARS)
+        if f.read(1):
+            content += "\n\n... (truncated)"
+    return content
+
+
+def _write_file(file_path: Path, content: str) -> None:
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(content)
+
+
+def _list_dir(dir_path: Path) -> list[str]:
+    # DirEntry answers is_dir/is_file from the directory listing and caches stat()
+    with os.scandir(dir_path) as it:
+        items = sorted(it, key=lambda e: e.name)
+    return [
+        f"{'[DIR] ' if item.is_dir() else ''}{item.name}"
+        f"{f' ({item.stat().st_size} bytes)' if item.is_file() else ''}"
+        for item in items
+    ]
+
+
+def _match_lines(data: bytes, query_bytes: bytes) -> list[str]:
+    """Up to _MAX_LINE_MATCHES "  L<n>: line" entries for lines containing query_bytes.
+
+    Scans one lowercased copy of the file and only decodes the matching lines.
+    """
+    data_lc = data.lower()
+    matches: list[str] = []
+    line_no, counted_to = 1, 0
+    pos = data_lc.find(query_bytes)
+    while pos >= 0 and len(matches) < _MAX_LINE_MATCHES:
+        start = data.rfind(b"\n", 0, pos) + 1
+        end = data.find(b"\n", pos)
+        if end < 0:
+            end = len(data)
+        line_no += data.count(b"\n", counted_to, start)
+        counted_to = start
+        line = data[start:end].decode("utf-8", "replace").strip()
+        matches.append(f"  L{line_no}: {line}")
+        pos = data_lc.find(query_bytes, end + 1)
+    return matches
+
+
+def _walk_search(base: Path, root: Path, query: str, search_names: bool) -> list[str]:
+    """Python fallback for search_files: walk base matching names or contents."""
+    results: list[str] = []
+    root_len = len(str(root)) + 1
+    # bytes.lower() only folds ASCII, so the bytes prefilter needs an ASCII query
+    query_bytes = query.encode() if query.isascii() else None
+    stack = [str(base)]
+    while stack and len(results) < _MAX_SEARCH_RESULTS:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir:
+                    stack.append(entry.path)
+                if search_names:
+                    if query in entry.name.lower():
+                        results.append(entry.path[root_len:])
+                elif not is_dir and entry.is_file(follow_symlinks=False):
+                    if os.path.splitext(entry.name)[1].lower() in _BINARY_SUFFIXES:
+                        continue
+                    try:
+                        with open(entry.path, "rb") as f:
+                            data = f.read(_SNIFF_BYTES)
+                            if b"\0" in data:
+                                continue
+                            data += f.read()
+                    except OSError:
+                        continue
+                    if query_bytes is not None:
+                        # ASCII query: match on bytes, decoding only the hit lines
+                        if b"\0" in data:  # binary file, like ripgrep skips
+                            continue
+                        matches = _match_lines(data, query_bytes)
+                        if matches:
+                            results.append(_format_matches(entry.path[root_len:], matches))
+                        continue
+                    try:
+                        content = data.decode()
+                    except UnicodeDecodeError:
+                        continue
+                    if query in content.lower():
+                        # Find matching lines
+                        matches = list(islice(
+                            (
+                                f"  L{i + 1}: {line.strip()}"
+                                for i, line in enumerate(io.StringIO(content))
+                                if query in line.lower()
+                            ),
+                            _MAX_LINE_MATCHES,
+                        ))
+                        results.append(_format_matches(entry.path[root_len:], matches))
+
+                if len(results) >= _MAX_SEARCH_RESULTS:
+                    results.append("... (truncated, too many results)")
+                    break
+    return results
+
 
 class ReadFileTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="read_file",
+        description="Read the contents of a text file from the sandboxed data directory.",
+        parameters=[
+            ToolParameter(name="path", type="string", description="Relative file path within the data directory"),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="read_file",
-            description="Read the contents of a text file from the sandboxed data directory.",
-            parameters=[
-                ToolParameter(name="path", type="string", description="Relative file path within the data directory"),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         path = kwargs["path"]
@@ -29,21 +227,23 @@ class ReadFileTool(BaseTool):
             return f"Error: Not a file: {path}"
 
         try:
-            return file_path.read_text()
+            return await asyncio.to_thread(_read_bounded, file_path)
         except UnicodeDecodeError:
             return f"Error: {path} is not a text file"
 
 
 class WriteFileTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="write_file",
+        description="Write content to a file in the sandboxed data directory. Creates parent directories if needed.",
+        parameters=[
+            ToolParameter(name="path", type="string", description="Relative file path within the data directory"),
+            ToolParameter(name="content", type="string", description="Content to write to the file"),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="write_file",
-            description="Write content to a file in the sandboxed data directory. Creates parent directories if needed.",
-            parameters=[
-                ToolParameter(name="path", type="string", description="Relative file path within the data directory"),
-                ToolParameter(name="content", type="string", description="Content to write to the file"),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         path = kwargs["path"]
@@ -53,24 +253,25 @@ class WriteFileTool(BaseTool):
         except SandboxError as e:
             return f"Error: {e}"
 
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_path.write_text(content)
+        await asyncio.to_thread(_write_file, file_path, content)
         return f"Successfully wrote to {path}"
 
 
 class ListFilesTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="list_files",
+        description="List files and directories in the sandboxed data directory.",
+        parameters=[
+            ToolParameter(
+                name="path", type="string",
+                description="Relative directory path within the data directory. Empty string for root.",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="list_files",
-            description="List files and directories in the sandboxed data directory.",
-            parameters=[
-                ToolParameter(
-                    name="path", type="string",
-                    description="Relative directory path within the data directory. Empty string for root.",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         path = kwargs.get("path", "")
@@ -84,36 +285,33 @@ class ListFilesTool(BaseTool):
         if not dir_path.is_dir():
             return f"Error: Not a directory: {path}"
 
-        entries = []
-        for item in sorted(dir_path.iterdir()):
-            prefix = "[DIR] " if item.is_dir() else ""
-            size = f" ({item.stat().st_size} bytes)" if item.is_file() else ""
-            entries.append(f"{prefix}{item.name}{size}")
-
+        entries = await asyncio.to_thread(_list_dir, dir_path)
         if not entries:
             return "Directory is empty"
         return "\n".join(entries)
 
 
 class SearchFilesTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="search_files",
+        description="Search for files by name pattern or search within file contents in the sandboxed data directory.",
+        parameters=[
+            ToolParameter(name="query", type="string", description="Text to search for in file names or contents"),
+            ToolParameter(
+                name="search_type", type="string",
+                description="Whether to search file names or file contents",
+                enum=["name", "content"],
+            ),
+            ToolParameter(
+                name="path", type="string",
+                description="Subdirectory to search in. Empty for root.",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="search_files",
-            description="Search for files by name pattern or search within file contents in the sandboxed data directory.",
-            parameters=[
-                ToolParameter(name="query", type="string", description="Text to search for in file names or contents"),
-                ToolParameter(
-                    name="search_type", type="string",
-                    description="Whether to search file names or file contents",
-                    enum=["name", "content"],
-                ),
-                ToolParameter(
-                    name="path", type="string",
-                    description="Subdirectory to search in. Empty for root.",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         query = kwargs["query"].lower()
@@ -128,32 +326,25 @@ class SearchFilesTool(BaseTool):
         if not base.exists():
             return f"Error: Directory not found: {path}"
 
-        results = []
-        for item in base.rglob("*"):
-            if search_type == "name":
-                if query in item.name.lower():
-                    rel = item.relative_to(resolve_sandboxed_path(""))
-                    results.append(str(rel))
-            elif search_type == "content" and item.is_file():
-                try:
-                    content = item.read_text()
-                    if query in content.lower():
-                        rel = item.relative_to(resolve_sandboxed_path(""))
-                        # Find matching lines
-                        lines = content.split("\n")
-                        matches = [
-                            f"  L{i + 1}: {line.strip()}"
-                            for i, line in enumerate(lines)
-                            if query in line.lower()
-                        ][:5]  # Max 5 matches per file
-                        results.append(f"{rel}\n" + "\n".join(matches))
-                except (UnicodeDecodeError, PermissionError):
-                    continue
-
-            if len(results) >= 20:
-                results.append("... (truncated, too many results)")
-                break
+        root = resolve_sandboxed_path("")
+        search_names = search_type == "name"
+        if search_names and "/" in query:
+            # "docs/readme": names never contain "/", so walk only docs/
+            head, _, query = kwargs["query"].rpartition("/")
+            query = query.lower()
+            try:
+                narrowed = resolve_sandboxed_path(os.path.join(path, head))
+            except SandboxError as e:
+                return f"Error: {e}"
+            if not narrowed.is_dir():
+                return "No results found"
+            base = narrowed
+        if search_type == "content":
+            rg_results = await _rg_content_search(base, root, query)
+            if rg_results is not None:
+                return "\n".join(rg_results) if rg_results else "No results found"
 
+        results = await asyncio.to_thread(_walk_search, base, root, query, search_names)
         if not results:
             return "No results found"
         return "\n".join(results)
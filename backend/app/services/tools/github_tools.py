@@ -1,76 +1,140 @@
 """GitHub integration tools - Projects, Repos, Issues."""
 
 import base64
-import json
+import codecs
+import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any
 
-from app.core.config import settings
-from app.services.integrations.github import GitHubService
+import httpx
+
+from app.services.integrations.github import get_github, load_project_sources
 from app.services.tools.base import BaseTool, ToolDefinition, ToolParameter
 
-_github = GitHubService()
+_github = get_github()
 
-_SOURCES_FILE = settings.data_dir / "github_project_sources.json"
+_READ_FILE_CHARS = 5000
 
+# Failures a tool reports back to the model as text: HTTP and GraphQL
+# errors, bad or missing arguments, undecodable content. Anything else is a
+# bug and propagates with its traceback.
+_TOOL_ERRORS = (httpx.HTTPError, RuntimeError, ValueError, KeyError)
 
-def _load_project_sources() -> list[str]:
-    if _SOURCES_FILE.exists():
-        try:
-            return json.loads(_SOURCES_FILE.read_text())
-        except Exception:
-            pass
-    return []
+# Short-lived cache for list-style reads, so repeated agent lookups within a
+# turn don't hit GitHub again. Cleared on any write made through these tools.
+_LIST_TTL = 45
+_LIST_CACHE_MAX = 128
+_list_cache: dict[tuple, tuple[Any, float]] = {}
+
+
+async def _cached(key: tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    cached = _list_cache.get(key)
+    if cached:
+        value, ts = cached
+        if time.time() - ts < _LIST_TTL:
+            return value
+    value = await fetch()
+    if len(_list_cache) >= _LIST_CACHE_MAX:
+        _list_cache.pop(next(iter(_list_cache)))
+    _list_cache[key] = (value, time.time())
+    return value
+
+
+# --- Output formatting (one line or block per result) ---
+
+
+def _format_repo(r: dict[str, Any]) -> str:
+    name = r.get("full_name", "?")
+    desc = r.get("description", "") or ""
+    private = " (private)" if r.get("private") else ""
+    return f"- {name}{private}: {desc[:80]}"
+
+
+def _format_issue(issue: dict[str, Any]) -> str:
+    num = issue.get("number")
+    title = issue.get("title", "?")
+    state = issue.get("state", "?")
+    labels = ", ".join(l["name"] for l in issue.get("labels", []))
+    label_str = f" [{labels}]" if labels else ""
+    return f"- #{num} ({state}){label_str}: {title}"
+
+
+def _format_project(p: dict[str, Any]) -> str:
+    title = p.get("title", "?")
+    num = p.get("number", "?")
+    desc = p.get("shortDescription", "") or ""
+    closed = " (closed)" if p.get("closed") else ""
+    pid = p.get("id", "")
+    owner_login = (p.get("owner") or {}).get("login", "")
+    owner_str = f" (owner: {owner_login})" if owner_login else ""
+    return f"- #{num}: {title}{closed}{owner_str} [node_id: {pid}]\n  {desc}"
+
+
+def _format_project_item(item: dict[str, Any]) -> str:
+    content = item.get("content", {}) or {}
+    title = content.get("title", "(Draft)")
+    number = content.get("number", "")
+    state = content.get("state", "")
+    url = content.get("url", "")
+
+    status = (item.get("status") or {}).get("name", "")
+
+    num_str = f"#{number} " if number else ""
+    state_str = f"({state}) " if state else ""
+    status_str = f"[{status}] " if status else ""
+    return f"- {status_str}{num_str}{state_str}{title}" + (f"\n  {url}" if url else "")
 
 
 class GitHubListReposTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="github_repos_list",
+        description="List the user's GitHub repositories, sorted by most recently updated.",
+        parameters=[
+            ToolParameter(
+                name="per_page", type="integer",
+                description="Number of repos to return (default 20).",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="github_repos_list",
-            description="List the user's GitHub repositories, sorted by most recently updated.",
-            parameters=[
-                ToolParameter(
-                    name="per_page", type="integer",
-                    description="Number of repos to return (default 20).",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
-            repos = await _github.list_repos(per_page=kwargs.get("per_page", 20))
-        except Exception as e:
+            per_page = kwargs.get("per_page", 20)
+            repos = await _cached(
+                ("repos", per_page), lambda: _github.list_repos(per_page=per_page)
+            )
+        except _TOOL_ERRORS as e:
             return f"Error listing repos: {e}"
 
         if not repos:
             return "No repositories found."
 
-        lines = []
-        for r in repos:
-            name = r.get("full_name", "?")
-            desc = r.get("description", "") or ""
-            private = " (private)" if r.get("private") else ""
-            lines.append(f"- {name}{private}: {desc[:80]}")
-        return "Repositories:\n" + "\n".join(lines)
+        return "Repositories:\n" + "\n".join(map(_format_repo, repos))
 
 
 class GitHubListIssuesTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="github_issues_list",
+        description="List issues for a GitHub repository.",
+        parameters=[
+            ToolParameter(name="owner", type="string", description="Repository owner"),
+            ToolParameter(name="repo", type="string", description="Repository name"),
+            ToolParameter(
+                name="state", type="string",
+                description="Issue state filter",
+                required=False,
+                enum=["open", "closed", "all"],
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="github_issues_list",
-            description="List issues for a GitHub repository.",
-            parameters=[
-                ToolParameter(name="owner", type="string", description="Repository owner"),
-                ToolParameter(name="repo", type="string", description="Repository name"),
-                ToolParameter(
-                    name="state", type="string",
-                    description="Issue state filter",
-                    required=False,
-                    enum=["open", "closed", "all"],
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -79,35 +143,29 @@ class GitHubListIssuesTool(BaseTool):
                 repo=kwargs["repo"],
                 state=kwargs.get("state", "open"),
             )
-        except Exception as e:
+        except _TOOL_ERRORS as e:
             return f"Error listing issues: {e}"
 
         if not issues:
             return "No issues found."
 
-        lines = []
-        for issue in issues:
-            num = issue.get("number")
-            title = issue.get("title", "?")
-            state = issue.get("state", "?")
-            labels = ", ".join(l["name"] for l in issue.get("labels", []))
-            label_str = f" [{labels}]" if labels else ""
-            lines.append(f"- #{num} ({state}){label_str}: {title}")
-        return "Issues:\n" + "\n".join(lines)
+        return "Issues:\n" + "\n".join(map(_format_issue, issues))
 
 
 class GitHubCreateIssueTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="github_issues_create",
+        description="Create a new issue in a GitHub repository.",
+        parameters=[
+            ToolParameter(name="owner", type="string", description="Repository owner"),
+            ToolParameter(name="repo", type="string", description="Repository name"),
+            ToolParameter(name="title", type="string", description="Issue title"),
+            ToolParameter(name="body", type="string", description="Issue body/description", required=False),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="github_issues_create",
-            description="Create a new issue in a GitHub repository.",
-            parameters=[
-                ToolParameter(name="owner", type="string", description="Repository owner"),
-                ToolParameter(name="repo", type="string", description="Repository name"),
-                ToolParameter(name="title", type="string", description="Issue title"),
-                ToolParameter(name="body", type="string", description="Issue body/description", required=False),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -117,23 +175,26 @@ class GitHubCreateIssueTool(BaseTool):
                 title=kwargs["title"],
                 body=kwargs.get("body", ""),
             )
+            _list_cache.clear()
             return f"Issue created: #{issue['number']} - {issue['title']} ({issue['html_url']})"
-        except Exception as e:
+        except _TOOL_ERRORS as e:
             return f"Error creating issue: {e}"
 
 
 class GitHubReadFileTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="github_repos_read_file",
+        description="Read a file from a GitHub repository.",
+        parameters=[
+            ToolParameter(name="owner", type="string", description="Repository owner"),
+            ToolParameter(name="repo", type="string", description="Repository name"),
+            ToolParameter(name="path", type="string", description="File path in the repository"),
+            ToolParameter(name="ref", type="string", description="Branch or commit ref (default 'main')", required=False),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="github_repos_read_file",
-            description="Read a file from a GitHub repository.",
-            parameters=[
-                ToolParameter(name="owner", type="string", description="Repository owner"),
-                ToolParameter(name="repo", type="string", description="Repository name"),
-                ToolParameter(name="path", type="string", description="File path in the repository"),
-                ToolParameter(name="ref", type="string", description="Branch or commit ref (default 'main')", required=False),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -144,86 +205,91 @@ class GitHubReadFileTool(BaseTool):
                 ref=kwargs.get("ref", "main"),
             )
             if data.get("type") == "file" and data.get("content"):
-                content = base64.b64decode(data["content"]).decode("utf-8")
-                if len(content) > 5000:
-                    content = content[:5000] + "\n\n... (truncated)"
+                # Only decode enough base64 for 5000 characters (at most 4 UTF-8
+                # bytes each) rather than the whole file
+                b64 = data["content"].replace("\n", "")
+                needed = -(-_READ_FILE_CHARS * 4 // 3) * 4
+                raw = base64.b64decode(b64[:needed])
+                # final=False drops a character split by the cut instead of failing
+                content = codecs.getincrementaldecoder("utf-8")().decode(raw, final=False)
+                if len(b64) > needed or len(content) > _READ_FILE_CHARS:
+                    content = content[:_READ_FILE_CHARS] + "\n\n... (truncated)"
                 return content
             return f"Not a file or empty: {data.get('type', '?')}"
-        except Exception as e:
+        except _TOOL_ERRORS as e:
             return f"Error reading file: {e}"
 
 
 class GitHubListProjectsTool(BaseTool):
-    def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="github_projects_list",
-            description=(
-                "List GitHub Projects (v2) the user has access to, "
-                "including projects from configured sources. "
-                "Call this with no arguments to see all accessible projects."
+    _DEF = ToolDefinition(
+        name="github_projects_list",
+        description=(
+            "List GitHub Projects (v2) the user has access to, "
+            "including projects from configured sources. "
+            "Call this with no arguments to see all accessible projects."
+        ),
+        parameters=[
+            ToolParameter(
+                name="owner", type="string",
+                description="Optional: a specific GitHub username or org to query. Leave empty to list all accessible projects.",
+                required=False,
             ),
-            parameters=[
-                ToolParameter(
-                    name="owner", type="string",
-                    description="Optional: a specific GitHub username or org to query. Leave empty to list all accessible projects.",
-                    required=False,
-                ),
-            ],
-        )
+        ],
+    )
+
+    def definition(self) -> ToolDefinition:
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
             owner = kwargs.get("owner")
             if owner:
-                projects = await _github.list_projects(owner=owner)
+                projects = await _cached(
+                    ("projects", owner), lambda: _github.list_projects(owner=owner)
+                )
             else:
-                sources = _load_project_sources()
-                projects = await _github.list_accessible_projects(extra_owners=sources)
-        except Exception as e:
+                sources = load_project_sources()
+                projects = await _cached(
+                    ("accessible_projects", tuple(sorted(sources))),
+                    lambda: _github.list_accessible_projects(extra_owners=sources),
+                )
+        except _TOOL_ERRORS as e:
             return f"Error listing projects: {e}"
 
         if not projects:
             return "No projects found."
 
-        lines = []
-        for p in projects:
-            title = p.get("title", "?")
-            num = p.get("number", "?")
-            desc = p.get("shortDescription", "") or ""
-            closed = " (closed)" if p.get("closed") else ""
-            pid = p.get("id", "")
-            owner_login = (p.get("owner") or {}).get("login", "")
-            owner_str = f" (owner: {owner_login})" if owner_login else ""
-            lines.append(f"- #{num}: {title}{closed}{owner_str} [node_id: {pid}]\n  {desc}")
-        return "Projects:\n" + "\n".join(lines)
+        return "Projects:\n" + "\n".join(map(_format_project, projects))
 
 
 class GitHubListProjectItemsTool(BaseTool):
-    def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="github_projects_items",
-            description=(
-                "List items (cards) in a GitHub Project. Shows status/column for each item. "
-                "You can provide either the project node_id directly, or an owner + project_number to resolve it."
+    _DEF = ToolDefinition(
+        name="github_projects_items",
+        description=(
+            "List items (cards) in a GitHub Project. Shows status/column for each item. "
+            "You can provide either the project node_id directly, or an owner + project_number to resolve it."
+        ),
+        parameters=[
+            ToolParameter(
+                name="project_id", type="string",
+                description="The Project node ID (e.g. 'PVT_kwHO...'). Optional if owner and project_number are provided.",
+                required=False,
+            ),
+            ToolParameter(
+                name="owner", type="string",
+                description="GitHub username or org that owns the project. Use with project_number.",
+                required=False,
             ),
-            parameters=[
-                ToolParameter(
-                    name="project_id", type="string",
-                    description="The Project node ID (e.g. 'PVT_kwHO...'). Optional if owner and project_number are provided.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="owner", type="string",
-                    description="GitHub username or org that owns the project. Use with project_number.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="project_number", type="integer",
-                    description="The project number (e.g. 3). Use with owner.",
-                    required=False,
-                ),
-            ],
-        )
+            ToolParameter(
+                name="project_number", type="integer",
+                description="The project number (e.g. 3). Use with owner.",
+                required=False,
+            ),
+        ],
+    )
+
+    def definition(self) -> ToolDefinition:
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -238,62 +304,48 @@ class GitHubListProjectItemsTool(BaseTool):
                 elif not project_id:
                     return "Error: provide either project_id, or owner + project_number."
 
-            items = await _github.list_project_items(project_id)
-        except Exception as e:
+            items = await _cached(
+                ("project_items", project_id), lambda: _github.list_project_items(project_id)
+            )
+        except _TOOL_ERRORS as e:
             return f"Error listing project items: {e}"
 
         if not items:
             return "No items in this project."
 
-        lines = []
-        for item in items:
-            content = item.get("content", {}) or {}
-            title = content.get("title", "(Draft)")
-            number = content.get("number", "")
-            state = content.get("state", "")
-            url = content.get("url", "")
-
-            # Get status field
-            status = ""
-            for fv in (item.get("fieldValues", {}).get("nodes", [])):
-                if fv.get("field", {}).get("name") == "Status":
-                    status = fv.get("name", "")
-
-            num_str = f"#{number} " if number else ""
-            state_str = f"({state}) " if state else ""
-            status_str = f"[{status}] " if status else ""
-            lines.append(f"- {status_str}{num_str}{state_str}{title}" + (f"\n  {url}" if url else ""))
-        return "Project items:\n" + "\n".join(lines)
+        return "Project items:\n" + "\n".join(map(_format_project_item, items))
 
 
 class GitHubAddProjectItemTool(BaseTool):
-    def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="github_projects_add_item",
-            description=(
-                "Add a draft issue/card to a GitHub Project. "
-                "You can provide either the project node_id directly, or an owner + project_number to resolve it."
+    _DEF = ToolDefinition(
+        name="github_projects_add_item",
+        description=(
+            "Add a draft issue/card to a GitHub Project. "
+            "You can provide either the project node_id directly, or an owner + project_number to resolve it."
+        ),
+        parameters=[
+            ToolParameter(
+                name="project_id", type="string",
+                description="The Project node ID (e.g. 'PVT_kwHO...'). Optional if owner and project_number are provided.",
+                required=False,
             ),
-            parameters=[
-                ToolParameter(
-                    name="project_id", type="string",
-                    description="The Project node ID (e.g. 'PVT_kwHO...'). Optional if owner and project_number are provided.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="owner", type="string",
-                    description="GitHub username or org that owns the project. Use with project_number.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="project_number", type="integer",
-                    description="The project number (e.g. 3). Use with owner.",
-                    required=False,
-                ),
-                ToolParameter(name="title", type="string", description="Title for the new card"),
-                ToolParameter(name="body", type="string", description="Description/body for the card", required=False),
-            ],
-        )
+            ToolParameter(
+                name="owner", type="string",
+                description="GitHub username or org that owns the project. Use with project_number.",
+                required=False,
+            ),
+            ToolParameter(
+                name="project_number", type="integer",
+                description="The project number (e.g. 3). Use with owner.",
+                required=False,
+            ),
+            ToolParameter(name="title", type="string", description="Title for the new card"),
+            ToolParameter(name="body", type="string", description="Description/body for the card", required=False),
+        ],
+    )
+
+    def definition(self) -> ToolDefinition:
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -312,6 +364,7 @@ class GitHubAddProjectItemTool(BaseTool):
                 title=kwargs["title"],
                 body=kwargs.get("body", ""),
             )
+            _list_cache.clear()
             return f"Card added to project (item id: {item.get('id', '?')})"
-        except Exception as e:
+        except _TOOL_ERRORS as e:
             return f"Error adding card: {e}"
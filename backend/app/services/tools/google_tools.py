@@ -21,31 +21,85 @@ def get_google_service() -> GoogleService:
     return _google_service
 
 
+def _split_ids(value: str) -> list[str]:
+    """Split a comma-separated ID argument, dropping blanks and duplicates."""
+    return list(dict.fromkeys(filter(None, (part.strip() for part in value.split(",")))))
+
+
+# --- Output formatting (one line or block per result) ---
+
+def _format_event(event: dict[str, Any]) -> str:
+    start_obj = event.get("start") or {}
+    start = start_obj.get("dateTime") or start_obj.get("date") or "?"
+    return f"- {start}: {event.get('summary', '(No title)')} [id: {event.get('id', '')}]"
+
+
+def _format_drive_file(f: dict[str, Any]) -> str:
+    link = f.get("webViewLink", "")
+    return (
+        f"- {f.get('name', '?')} ({f.get('mimeType', '')}) [id: {f.get('id', '')}]"
+        + (f"\n  {link}" if link else "")
+    )
+
+
+def _format_email(msg: dict[str, Any]) -> str:
+    return (
+        f"- [{msg.get('date', '')}] From: {msg.get('from', '?')}\n"
+        f"  Subject: {msg.get('subject', '(No subject)')}\n"
+        f"  {msg.get('snippet', '')[:80]}"
+    )
+
+
+_SHOWN_HEADERS = frozenset({"From", "To", "Date", "Subject"})
+
+
+def _format_message(msg: dict[str, Any]) -> str:
+    if "error" in msg:
+        return f"Error reading email: {msg['error'].get('message') or msg['error'].get('code')}"
+    # Pick out the four headers shown, stopping once all are found
+    headers: dict[str, str] = {}
+    for h in msg.get("payload", {}).get("headers", []):
+        if h["name"] in _SHOWN_HEADERS:
+            headers[h["name"]] = h["value"]
+            if len(headers) == len(_SHOWN_HEADERS):
+                break
+    snippet = msg.get("snippet", "")
+    return (
+        f"From: {headers.get('From', '?')}\n"
+        f"To: {headers.get('To', '?')}\n"
+        f"Date: {headers.get('Date', '?')}\n"
+        f"Subject: {headers.get('Subject', '?')}\n\n"
+        f"{snippet}"
+    )
+
+
 # --- Calendar Tools ---
 
 class CalendarListEventsTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="google_calendar_list",
+        description="List upcoming events from Google Calendar.",
+        parameters=[
+            ToolParameter(
+                name="time_min", type="string",
+                description="Start time in ISO 8601 format (e.g., '2026-02-16T00:00:00Z'). Defaults to now.",
+                required=False,
+            ),
+            ToolParameter(
+                name="time_max", type="string",
+                description="End time in ISO 8601 format. Defaults to 7 days from now.",
+                required=False,
+            ),
+            ToolParameter(
+                name="max_results", type="integer",
+                description="Maximum number of events to return (default 10).",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="google_calendar_list",
-            description="List upcoming events from Google Calendar.",
-            parameters=[
-                ToolParameter(
-                    name="time_min", type="string",
-                    description="Start time in ISO 8601 format (e.g., '2026-02-16T00:00:00Z'). Defaults to now.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="time_max", type="string",
-                    description="End time in ISO 8601 format. Defaults to 7 days from now.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="max_results", type="integer",
-                    description="Maximum number of events to return (default 10).",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -60,28 +114,24 @@ class CalendarListEventsTool(BaseTool):
         if not events:
             return "No upcoming events found."
 
-        lines = []
-        for event in events:
-            start = event.get("start", {}).get("dateTime", event.get("start", {}).get("date", "?"))
-            summary = event.get("summary", "(No title)")
-            event_id = event.get("id", "")
-            lines.append(f"- {start}: {summary} [id: {event_id}]")
-        return "Upcoming events:\n" + "\n".join(lines)
+        return "Upcoming events:\n" + "\n".join(map(_format_event, events))
 
 
 class CalendarCreateEventTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="google_calendar_create",
+        description="Create a new event on Google Calendar.",
+        parameters=[
+            ToolParameter(name="summary", type="string", description="Event title"),
+            ToolParameter(name="start", type="string", description="Start time in ISO 8601 format"),
+            ToolParameter(name="end", type="string", description="End time in ISO 8601 format"),
+            ToolParameter(name="description", type="string", description="Event description", required=False),
+            ToolParameter(name="location", type="string", description="Event location", required=False),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="google_calendar_create",
-            description="Create a new event on Google Calendar.",
-            parameters=[
-                ToolParameter(name="summary", type="string", description="Event title"),
-                ToolParameter(name="start", type="string", description="Start time in ISO 8601 format"),
-                ToolParameter(name="end", type="string", description="End time in ISO 8601 format"),
-                ToolParameter(name="description", type="string", description="Event description", required=False),
-                ToolParameter(name="location", type="string", description="Event location", required=False),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -98,43 +148,62 @@ class CalendarCreateEventTool(BaseTool):
 
 
 class CalendarDeleteEventTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="google_calendar_delete",
+        description="Delete one or more events from Google Calendar.",
+        parameters=[
+            ToolParameter(
+                name="event_id", type="string",
+                description="The event ID to delete, or several IDs separated by commas",
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="google_calendar_delete",
-            description="Delete an event from Google Calendar.",
-            parameters=[
-                ToolParameter(name="event_id", type="string", description="The event ID to delete"),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
+        event_ids = _split_ids(kwargs["event_id"])
+        if not event_ids:
+            return "Error: no event IDs given."
         try:
-            await _calendar.delete_event(kwargs["event_id"])
-            return "Event deleted successfully."
+            if len(event_ids) == 1:
+                await _calendar.delete_event(event_ids[0])
+                return "Event deleted successfully."
+            # Several deletions share one batch request
+            failed = await _calendar.delete_events_bulk(event_ids)
         except Exception as e:
             return f"Error deleting event: {e}"
+        if failed:
+            return (
+                f"Deleted {len(event_ids) - len(failed)} of {len(event_ids)} events. "
+                f"Failed: {', '.join(failed)}"
+            )
+        return f"Deleted {len(event_ids)} events successfully."
 
 
 # --- Drive Tools ---
 
 class DriveListFilesTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="google_drive_list",
+        description="List files in Google Drive.",
+        parameters=[
+            ToolParameter(
+                name="query", type="string",
+                description="Search query to filter files by name.",
+                required=False,
+            ),
+            ToolParameter(
+                name="max_results", type="integer",
+                description="Maximum number of files to return (default 20).",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="google_drive_list",
-            description="List files in Google Drive.",
-            parameters=[
-                ToolParameter(
-                    name="query", type="string",
-                    description="Search query to filter files by name.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="max_results", type="integer",
-                    description="Maximum number of files to return (default 20).",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -148,25 +217,20 @@ class DriveListFilesTool(BaseTool):
         if not files:
             return "No files found."
 
-        lines = []
-        for f in files:
-            name = f.get("name", "?")
-            mime = f.get("mimeType", "")
-            link = f.get("webViewLink", "")
-            fid = f.get("id", "")
-            lines.append(f"- {name} ({mime}) [id: {fid}]" + (f"\n  {link}" if link else ""))
-        return "Drive files:\n" + "\n".join(lines)
+        return "Drive files:\n" + "\n".join(map(_format_drive_file, files))
 
 
 class DriveSearchTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="google_drive_search",
+        description="Search for files in Google Drive.",
+        parameters=[
+            ToolParameter(name="query", type="string", description="Search query"),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="google_drive_search",
-            description="Search for files in Google Drive.",
-            parameters=[
-                ToolParameter(name="query", type="string", description="Search query"),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -177,32 +241,33 @@ class DriveSearchTool(BaseTool):
         if not files:
             return f"No files found for: {kwargs['query']}"
 
-        lines = []
-        for f in files:
-            lines.append(f"- {f.get('name')} [id: {f.get('id')}]")
-        return "Search results:\n" + "\n".join(lines)
+        return "Search results:\n" + "\n".join(
+            f"- {f.get('name')} [id: {f.get('id')}]" for f in files
+        )
 
 
 # --- Gmail Tools ---
 
 class GmailListTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="google_gmail_list",
+        description="List recent emails from Gmail.",
+        parameters=[
+            ToolParameter(
+                name="query", type="string",
+                description="Gmail search query (e.g., 'is:unread', 'from:user@example.com'). Empty for recent messages.",
+                required=False,
+            ),
+            ToolParameter(
+                name="max_results", type="integer",
+                description="Maximum number of emails to return (default 10).",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="google_gmail_list",
-            description="List recent emails from Gmail.",
-            parameters=[
-                ToolParameter(
-                    name="query", type="string",
-                    description="Gmail search query (e.g., 'is:unread', 'from:user@example.com'). Empty for recent messages.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="max_results", type="integer",
-                    description="Maximum number of emails to return (default 10).",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -216,57 +281,52 @@ class GmailListTool(BaseTool):
         if not messages:
             return "No emails found."
 
-        lines = []
-        for msg in messages:
-            subject = msg.get("subject", "(No subject)")
-            sender = msg.get("from", "?")
-            date = msg.get("date", "")
-            snippet = msg.get("snippet", "")[:80]
-            lines.append(f"- [{date}] From: {sender}\n  Subject: {subject}\n  {snippet}")
-        return "Emails:\n" + "\n".join(lines)
+        return "Emails:\n" + "\n".join(map(_format_email, messages))
 
 
 class GmailReadTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="google_gmail_read",
+        description="Read one or more emails by ID.",
+        parameters=[
+            ToolParameter(
+                name="message_id", type="string",
+                description="The email message ID, or several IDs separated by commas",
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="google_gmail_read",
-            description="Read a specific email by ID.",
-            parameters=[
-                ToolParameter(name="message_id", type="string", description="The email message ID"),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
+        msg_ids = _split_ids(kwargs["message_id"])
+        if not msg_ids:
+            return "Error: no message IDs given."
         try:
-            msg = await _gmail.read_message(kwargs["message_id"])
-            # Extract text content
-            snippet = msg.get("snippet", "")
-            headers = {
-                h["name"]: h["value"]
-                for h in msg.get("payload", {}).get("headers", [])
-            }
-            return (
-                f"From: {headers.get('From', '?')}\n"
-                f"To: {headers.get('To', '?')}\n"
-                f"Date: {headers.get('Date', '?')}\n"
-                f"Subject: {headers.get('Subject', '?')}\n\n"
-                f"{snippet}"
-            )
+            if len(msg_ids) == 1:
+                msgs = [await _gmail.read_message(msg_ids[0])]
+            else:
+                # Several reads share one batch request
+                msgs = await _gmail.read_messages(msg_ids)
         except Exception as e:
             return f"Error reading email: {e}"
+        return "\n\n---\n\n".join(map(_format_message, msgs))
 
 
 class GmailSendTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="google_gmail_send",
+        description="Send an email via Gmail.",
+        parameters=[
+            ToolParameter(name="to", type="string", description="Recipient email address"),
+            ToolParameter(name="subject", type="string", description="Email subject"),
+            ToolParameter(name="body", type="string", description="Email body text"),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="google_gmail_send",
-            description="Send an email via Gmail.",
-            parameters=[
-                ToolParameter(name="to", type="string", description="Recipient email address"),
-                ToolParameter(name="subject", type="string", description="Email subject"),
-                ToolParameter(name="body", type="string", description="Email body text"),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         try:
@@ -1,28 +1,79 @@
 """Note-taking tools for the agent including health/fitness notes."""
 
+import asyncio
+import os
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
-from app.core.sandbox import resolve_sandboxed_path
+from app.core.sandbox import SandboxError, resolve_sandboxed_path
 from app.services.drive_sync import sync_note_to_drive
 from app.services.tools.base import BaseTool, ToolDefinition, ToolParameter
 
 
+def _append_note(file_path: Path, header: str, entry: str) -> None:
+    """Append *entry* to a note file, starting a new file with *header*.
+
+    Appending keeps each write proportional to the entry rather than to the
+    day's whole log.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with file_path.open("a", encoding="utf-8") as f:
+        if f.tell() == 0:
+            f.write(header)
+        f.write(entry)
+
+
+def _read_note(file_path: Path) -> str | None:
+    try:
+        return file_path.read_text()
+    except FileNotFoundError:
+        return None
+
+
+def _scan_notes(folder: str) -> list[str]:
+    """Sandbox-relative paths of the markdown notes under *folder*, sorted."""
+    try:
+        base = resolve_sandboxed_path(folder)
+    except SandboxError:
+        return []
+    root_len = len(str(resolve_sandboxed_path(""))) + 1
+    found: list[str] = []
+    stack = [str(base)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    found.append(entry.path[root_len:])
+    # Order as Path sorting does, component by component: with the separator
+    # mapped to the lowest character, plain string order gives the same result
+    found.sort(key=lambda rel: rel.replace(os.sep, "\0"))
+    return found
+
+
 class HealthNoteTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="health_note",
+        description="Log a health or fitness note. Notes are organized by date in the health/ folder.",
+        parameters=[
+            ToolParameter(name="content", type="string", description="The health/fitness note to log"),
+            ToolParameter(
+                name="category", type="string",
+                description="Category for the note",
+                required=False,
+                enum=["general", "exercise", "nutrition", "sleep", "weight", "mood", "symptoms"],
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="health_note",
-            description="Log a health or fitness note. Notes are organized by date in the health/ folder.",
-            parameters=[
-                ToolParameter(name="content", type="string", description="The health/fitness note to log"),
-                ToolParameter(
-                    name="category", type="string",
-                    description="Category for the note",
-                    required=False,
-                    enum=["general", "exercise", "nutrition", "sleep", "weight", "mood", "symptoms"],
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         content = kwargs["content"]
@@ -32,35 +83,29 @@ class HealthNoteTool(BaseTool):
         time_str = now.strftime("%H:%M")
 
         file_path = resolve_sandboxed_path(f"health/{date_str}.md")
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-
         entry = f"\n### [{time_str}] {category}\n{content}\n"
-
-        if file_path.exists():
-            existing = file_path.read_text()
-        else:
-            existing = f"# Health Log - {date_str}\n"
-
-        file_path.write_text(existing + entry)
+        await asyncio.to_thread(_append_note, file_path, f"# Health Log - {date_str}\n", entry)
         await sync_note_to_drive("health", date_str)
         return f"Health note logged ({category}) for {date_str} at {time_str}"
 
 
 class QuickNoteTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="quick_note",
+        description="Save a quick note. Notes are stored in the notes/ folder, organized by date or custom path.",
+        parameters=[
+            ToolParameter(name="content", type="string", description="The note content"),
+            ToolParameter(name="title", type="string", description="Short title for the note"),
+            ToolParameter(
+                name="path", type="string",
+                description="Custom path within notes/ folder (e.g., 'projects/ideas.md'). If not provided, saves to daily note.",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="quick_note",
-            description="Save a quick note. Notes are stored in the notes/ folder, organized by date or custom path.",
-            parameters=[
-                ToolParameter(name="content", type="string", description="The note content"),
-                ToolParameter(name="title", type="string", description="Short title for the note"),
-                ToolParameter(
-                    name="path", type="string",
-                    description="Custom path within notes/ folder (e.g., 'projects/ideas.md'). If not provided, saves to daily note.",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         content = kwargs["content"]
@@ -75,57 +120,44 @@ class QuickNoteTool(BaseTool):
             date_str = now.strftime("%Y-%m-%d")
             file_path = resolve_sandboxed_path(f"notes/daily/{date_str}.md")
 
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-
         entry = f"\n## {title} [{time_str}]\n{content}\n"
-
-        if file_path.exists():
-            existing = file_path.read_text()
-        else:
-            header = f"# Notes - {file_path.stem}\n"
-            existing = header
-
-        file_path.write_text(existing + entry)
+        await asyncio.to_thread(_append_note, file_path, f"# Notes - {file_path.stem}\n", entry)
         if not custom_path:
             await sync_note_to_drive("daily", date_str)
         return f"Note saved: {title}"
 
 
 class ReadNotesTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="read_notes",
+        description="Read notes from the notes/ or health/ folder. Can read a specific file or list available notes.",
+        parameters=[
+            ToolParameter(
+                name="path", type="string",
+                description="Path to read (e.g., 'notes/daily/2026-02-16.md' or 'health/2026-02-16.md'). Leave empty to list available note files.",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="read_notes",
-            description="Read notes from the notes/ or health/ folder. Can read a specific file or list available notes.",
-            parameters=[
-                ToolParameter(
-                    name="path", type="string",
-                    description="Path to read (e.g., 'notes/daily/2026-02-16.md' or 'health/2026-02-16.md'). Leave empty to list available note files.",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         path = kwargs.get("path", "")
 
         if path:
             file_path = resolve_sandboxed_path(path)
-            if not file_path.exists():
+            content = await asyncio.to_thread(_read_note, file_path)
+            if content is None:
                 return f"Note not found: {path}"
-            return file_path.read_text()
-
-        # List available notes
-        entries = []
-        for folder in ["notes", "health"]:
-            try:
-                folder_path = resolve_sandboxed_path(folder)
-                if folder_path.exists():
-                    for item in sorted(folder_path.rglob("*.md")):
-                        rel = item.relative_to(resolve_sandboxed_path(""))
-                        entries.append(str(rel))
-            except Exception:
-                continue
+            return content
 
+        # Walk both folders concurrently, off the event loop
+        listings = await asyncio.gather(
+            *(asyncio.to_thread(_scan_notes, folder) for folder in ("notes", "health"))
+        )
+        entries = [entry for listing in listings for entry in listing]
         if not entries:
             return "No notes found"
         return "Available notes:\n" + "\n".join(f"- {e}" for e in entries)
@@ -1,5 +1,7 @@
 """Tool registry - central place to register and look up all available tools."""
 
+from collections.abc import Awaitable, Callable
+
 from app.services.tools.base import BaseTool, ToolDefinition
 from app.services.tools.file_tools import (
     ListFilesTool,
@@ -43,19 +45,33 @@ from app.services.tools.wordpress_tools import (
 class ToolRegistry:
     def __init__(self) -> None:
         self._tools: dict[str, BaseTool] = {}
+        # Definitions are static per tool, so keep the one built at registration
+        self._definitions: dict[str, ToolDefinition] = {}
+        self._declarations: list[dict] | None = None
+        # Bound execute methods, so dispatching a call is a single dict lookup
+        self._executors: dict[str, Callable[..., Awaitable[str]]] = {}
 
     def register(self, tool: BaseTool) -> None:
         defn = tool.definition()
         self._tools[defn.name] = tool
+        self._definitions[defn.name] = defn
+        self._executors[defn.name] = tool.execute
+        self._declarations = None
 
     def get(self, name: str) -> BaseTool | None:
         return self._tools.get(name)
 
+    def executor(self, name: str) -> Callable[..., Awaitable[str]] | None:
+        """Return the named tool's execute method, or None if it isn't registered."""
+        return self._executors.get(name)
+
     def definitions(self) -> list[ToolDefinition]:
-        return [tool.definition() for tool in self._tools.values()]
+        return list(self._definitions.values())
 
     def gemini_declarations(self) -> list[dict]:
-        return [defn.to_gemini_schema() for defn in self.definitions()]
+        if self._declarations is None:
+            self._declarations = [defn.to_gemini_schema() for defn in self.definitions()]
+        return self._declarations
 
 
 def create_default_registry() -> ToolRegistry:
@@ -1,109 +1,248 @@
 """Web browsing and search tools for the agent."""
 
-import re
+import asyncio
+import time
 from typing import Any
 
 import httpx
+from lxml import etree
+from lxml import html as lxml_html
 
 from app.services.tools.base import BaseTool, ToolDefinition, ToolParameter
+from app.services.tools.note_tools import _append_note
+
+# One connection pool for web_browse and web_search, so repeated fetches from
+# the same host reuse the TLS connection instead of handshaking every call.
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers={"User-Agent": "AI-Assistant/0.1"},
+            follow_redirects=True,
+            timeout=15.0,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _client
+
+
+# web_browse reads at most this much of a page before extracting text
+_MAX_PAGE_CHARS = 200_000
+
+
+def _is_text(content_type: str) -> bool:
+    mime = content_type.partition(";")[0].strip().lower()
+    return (
+        not mime
+        or mime.startswith("text/")
+        or mime in ("application/json", "application/xml")
+        or mime.endswith(("+xml", "+json"))
+    )
+
+
+# Page text is already decoded by httpx; re-encode it so lxml doesn't reject
+# documents that carry their own XML encoding declaration
+_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+
+# Never part of a page's readable content
+_NON_CONTENT_TAGS = ("script", "style", "noscript", "template", "nav", "aside", "footer")
+
+
+def _html_to_text(content: str) -> str:
+    """Readable text of an HTML page, whitespace-collapsed.
+
+    Navigation, sidebars and footers are dropped, and the page's <main>
+    (or its only <article>) is preferred over the whole body, so the
+    truncated text the model sees is mostly the actual content.
+    """
+    try:
+        doc = lxml_html.document_fromstring(content.encode(), parser=_HTML_PARSER)
+    except etree.ParserError:  # empty document
+        return ""
+    etree.strip_elements(doc, *_NON_CONTENT_TAGS, with_tail=False)
+    body = doc.find("body")
+    if body is None:
+        body = doc
+    root = doc.find(".//main")
+    if root is None:
+        articles = doc.findall(".//article")
+        root = articles[0] if len(articles) == 1 else body
+    text = " ".join(" ".join(root.itertext()).split())
+    if not text and root is not body:
+        # An empty <main> is usually a client-rendered shell
+        text = " ".join(" ".join(body.itertext()).split())
+    return text
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# DuckDuckGo HTML results, skipping sponsored ones
+_XP_DDG_RESULT = etree.XPath(f"//div[{_has_class('result')} and not({_has_class('result--ad')})]")
+_XP_DDG_TITLE = etree.XPath(f".//a[{_has_class('result__a')}]")
+_XP_DDG_SNIPPET = etree.XPath(f".//*[{_has_class('result__snippet')}]")
+
+
+def _parse_ddg_results(html: str, num: int) -> list[str]:
+    """Format up to *num* results from a DuckDuckGo HTML results page."""
+    try:
+        doc = lxml_html.document_fromstring(html.encode(), parser=_HTML_PARSER)
+    except etree.ParserError:
+        return []
+    results: list[str] = []
+    for node in _XP_DDG_RESULT(doc):
+        links = _XP_DDG_TITLE(node)
+        if not links:
+            continue
+        title = " ".join(links[0].text_content().split())
+        snippets = _XP_DDG_SNIPPET(node)
+        snippet = " ".join(snippets[0].text_content().split()) if snippets else ""
+        results.append(f"- {title}\n  {links[0].get('href', '')}\n  {snippet}")
+        if len(results) >= num:
+            break
+    return results
+
+
+# Agents often repeat the same search or fetch within a turn; successful
+# results are reused for a short while. Errors are never cached.
+_RESULT_TTL = 120
+_RESULT_CACHE_MAX = 512
+_result_cache: dict[tuple, tuple[str, float]] = {}
+
+
+def _cached_result(key: tuple) -> str | None:
+    cached = _result_cache.get(key)
+    if cached:
+        value, ts = cached
+        if time.time() - ts < _RESULT_TTL:
+            return value
+        del _result_cache[key]
+    return None
+
+
+def _store_result(key: tuple, value: str) -> str:
+    if len(_result_cache) >= _RESULT_CACHE_MAX:
+        _result_cache.pop(next(iter(_result_cache)))
+    _result_cache[key] = (value, time.time())
+    return value
+
+
+async def aclose() -> None:
+    """Close the shared HTTP client (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 class WebBrowseTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="web_browse",
+        description="Fetch a web page and return its text content. Useful for reading articles, documentation, or any URL.",
+        parameters=[
+            ToolParameter(name="url", type="string", description="The URL to fetch"),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="web_browse",
-            description="Fetch a web page and return its text content. Useful for reading articles, documentation, or any URL.",
-            parameters=[
-                ToolParameter(name="url", type="string", description="The URL to fetch"),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         url = kwargs["url"]
+        key = ("browse", url)
+        if (cached := _cached_result(key)) is not None:
+            return cached
         try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=15.0) as client:
-                response = await client.get(url, headers={"User-Agent": "AI-Assistant/0.1"})
+            async with _get_client().stream("GET", url) as response:
                 response.raise_for_status()
-                content = response.text
+                content_type = response.headers.get("content-type", "")
+                if not _is_text(content_type):
+                    return f"Error fetching {url}: not a text page ({content_type})"
+                # Only the first few KB of text survive, so stop downloading early
+                chunks: list[str] = []
+                size = 0
+                async for chunk in response.aiter_text():
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= _MAX_PAGE_CHARS:
+                        break
+            content = "".join(chunks)
         except httpx.HTTPError as e:
             return f"Error fetching {url}: {e}"
 
-        # Strip HTML tags for a rough text extraction
-        text = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.DOTALL)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL)
-        text = re.sub(r'<[^>]+>', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _html_to_text(content)
 
         # Truncate to avoid overwhelming the LLM context
         max_chars = 8000
         if len(text) > max_chars:
             text = text[:max_chars] + "\n\n... (content truncated)"
 
-        return f"Content from {url}:\n\n{text}"
+        return _store_result(key, f"Content from {url}:\n\n{text}")
 
 
 class WebSearchTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="web_search",
+        description="Search the web using DuckDuckGo and return results. Use this to find current information.",
+        parameters=[
+            ToolParameter(name="query", type="string", description="The search query"),
+            ToolParameter(
+                name="num_results", type="integer",
+                description="Number of results to return (default 5, max 10)",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="web_search",
-            description="Search the web using DuckDuckGo and return results. Use this to find current information.",
-            parameters=[
-                ToolParameter(name="query", type="string", description="The search query"),
-                ToolParameter(
-                    name="num_results", type="integer",
-                    description="Number of results to return (default 5, max 10)",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         query = kwargs["query"]
         num = min(kwargs.get("num_results", 5), 10)
+        key = ("search", query, num)
+        if (cached := _cached_result(key)) is not None:
+            return cached
 
         try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=10.0) as client:
-                # Use DuckDuckGo HTML search
-                response = await client.get(
-                    "https://html.duckduckgo.com/html/",
-                    params={"q": query},
-                    headers={"User-Agent": "AI-Assistant/0.1"},
-                )
-                response.raise_for_status()
-                html = response.text
+            # Use DuckDuckGo HTML search
+            response = await _get_client().get(
+                "https://html.duckduckgo.com/html/",
+                params={"q": query},
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            html = response.text
         except httpx.HTTPError as e:
             return f"Search error: {e}"
 
-        # Parse results from DuckDuckGo HTML
-        results = []
-        result_blocks = re.findall(
-            r'<a rel="nofollow" class="result__a" href="([^"]+)"[^>]*>(.*?)</a>.*?'
-            r'<a class="result__snippet"[^>]*>(.*?)</a>',
-            html, re.DOTALL,
-        )
-
-        for href, title, snippet in result_blocks[:num]:
-            title = re.sub(r'<[^>]+>', '', title).strip()
-            snippet = re.sub(r'<[^>]+>', '', snippet).strip()
-            results.append(f"- {title}\n  {href}\n  {snippet}")
-
+        results = _parse_ddg_results(html, num)
         if not results:
             return f"No results found for: {query}"
 
-        return f"Search results for '{query}':\n\n" + "\n\n".join(results)
+        return _store_result(
+            key, f"Search results for '{query}':\n\n" + "\n\n".join(results)
+        )
 
 
 class SaveBookmarkTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="save_bookmark",
+        description="Save a URL as a bookmark with a title and optional summary to the bookmarks file.",
+        parameters=[
+            ToolParameter(name="url", type="string", description="The URL to bookmark"),
+            ToolParameter(name="title", type="string", description="Title for the bookmark"),
+            ToolParameter(name="summary", type="string", description="Brief summary of the content", required=False),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="save_bookmark",
-            description="Save a URL as a bookmark with a title and optional summary to the bookmarks file.",
-            parameters=[
-                ToolParameter(name="url", type="string", description="The URL to bookmark"),
-                ToolParameter(name="title", type="string", description="Title for the bookmark"),
-                ToolParameter(name="summary", type="string", description="Brief summary of the content", required=False),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         from app.core.sandbox import resolve_sandboxed_path
@@ -113,17 +252,12 @@ class SaveBookmarkTool(BaseTool):
         summary = kwargs.get("summary", "")
 
         bookmarks_path = resolve_sandboxed_path("bookmarks.md")
-        bookmarks_path.parent.mkdir(parents=True, exist_ok=True)
 
         entry = f"\n## [{title}]({url})\n"
         if summary:
             entry += f"{summary}\n"
         entry += "\n---\n"
 
-        if bookmarks_path.exists():
-            existing = bookmarks_path.read_text()
-        else:
-            existing = "# Bookmarks\n"
-
-        bookmarks_path.write_text(existing + entry)
+        await asyncio.to_thread(_append_note, bookmarks_path, "# Bookmarks\n", entry)
         return f"Bookmark saved: {title} ({url})"
+
@@ -1,40 +1,78 @@
 """WordPress integration tools - Posts, Media, Tags, Categories."""
 
+import asyncio
+import re
+from collections.abc import Awaitable, Callable
 from typing import Any
 
-from app.core.config import settings
-from app.services.integrations.wordpress import WordPressService
+from app.core.sandbox import SandboxError, resolve_sandboxed_path
+from app.services.integrations.wordpress import get_wordpress
 from app.services.tools.base import BaseTool, ToolDefinition, ToolParameter
 
-_wp = WordPressService()
+_wp = get_wordpress()
+
+# Comments first (they may contain ">"), then tags. A tag can't contain "<",
+# so a stray unclosed "<" costs one scan to the next "<", not to the end.
+_TAG_RE = re.compile(r"<!--.*?-->|<[^<>]+>", re.DOTALL)
 
 
 def _strip_html(html: str) -> str:
     """Naively strip HTML tags for text summaries."""
-    import re
-    text = re.sub(r"<[^>]+>", "", html)
-    return text.strip()
+    if "<" not in html:  # plain titles and excerpts skip the regex
+        return html.strip()
+    return _TAG_RE.sub("", html).strip()
+
+
+# Update arguments passed to the service unchanged when given
+_UPDATE_FIELDS = ("title", "content", "status", "excerpt")
+
+
+def _format_post_line(p: dict[str, Any]) -> str:
+    title = _strip_html((p.get("title") or {}).get("rendered", "Untitled"))
+    return f"- [{p.get('status', '?')}] #{p.get('id', '?')}: {title}"
+
+
+def _format_term_line(term: dict[str, Any]) -> str:
+    return f"- {term['name']} (ID: {term['id']}, count: {term.get('count', 0)})"
+
+
+async def _resolve_terms(kwargs: dict[str, Any]) -> tuple[list[int] | None, list[int] | None]:
+    """Resolve the comma-separated categories and tags arguments to term IDs.
+
+    The two taxonomies are looked up concurrently; either is None when its
+    argument wasn't given. Names are cleaned and deduplicated by the service.
+    """
+    async def resolve(key: str, lookup: Callable[[list[str]], Awaitable[list[int]]]):
+        return await lookup(kwargs[key].split(",")) if kwargs.get(key) else None
+
+    cat_ids, tag_ids = await asyncio.gather(
+        resolve("categories", _wp.get_or_create_categories),
+        resolve("tags", _wp.get_or_create_tags),
+    )
+    return cat_ids, tag_ids
 
 
 class WordPressListPostsTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="wordpress_posts_list",
+        description="List recent WordPress posts. Can filter by status.",
+        parameters=[
+            ToolParameter(
+                name="status", type="string",
+                description="Post status filter (default 'any').",
+                required=False,
+                enum=["publish", "draft", "pending", "private", "any"],
+            ),
+            ToolParameter(
+                name="per_page", type="integer",
+                description="Number of posts to return (default 10).",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="wordpress_posts_list",
-            description="List recent WordPress posts. Can filter by status.",
-            parameters=[
-                ToolParameter(
-                    name="status", type="string",
-                    description="Post status filter (default 'any').",
-                    required=False,
-                    enum=["publish", "draft", "pending", "private", "any"],
-                ),
-                ToolParameter(
-                    name="per_page", type="integer",
-                    description="Number of posts to return (default 10).",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         if not _wp.is_configured:
@@ -50,24 +88,20 @@ class WordPressListPostsTool(BaseTool):
         if not posts:
             return "No posts found."
 
-        lines = []
-        for p in posts:
-            title = _strip_html(p.get("title", {}).get("rendered", "Untitled"))
-            status = p.get("status", "?")
-            pid = p.get("id", "?")
-            lines.append(f"- [{status}] #{pid}: {title}")
-        return "WordPress posts:\n" + "\n".join(lines)
+        return "WordPress posts:\n" + "\n".join(map(_format_post_line, posts))
 
 
 class WordPressGetPostTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="wordpress_posts_get",
+        description="Get a WordPress post by ID, including full content.",
+        parameters=[
+            ToolParameter(name="post_id", type="integer", description="The post ID"),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="wordpress_posts_get",
-            description="Get a WordPress post by ID, including full content.",
-            parameters=[
-                ToolParameter(name="post_id", type="integer", description="The post ID"),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         if not _wp.is_configured:
@@ -95,60 +129,55 @@ class WordPressGetPostTool(BaseTool):
 
 
 class WordPressCreatePostTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="wordpress_posts_create",
+        description="Create a new WordPress post. Categories and tags accept comma-separated names (will be created if they don't exist).",
+        parameters=[
+            ToolParameter(name="title", type="string", description="Post title"),
+            ToolParameter(name="content", type="string", description="Post content (HTML supported)"),
+            ToolParameter(
+                name="status", type="string",
+                description="Post status (default 'draft').",
+                required=False,
+                enum=["publish", "draft", "pending", "private"],
+            ),
+            ToolParameter(
+                name="categories", type="string",
+                description="Comma-separated category names.",
+                required=False,
+            ),
+            ToolParameter(
+                name="tags", type="string",
+                description="Comma-separated tag names.",
+                required=False,
+            ),
+            ToolParameter(
+                name="excerpt", type="string",
+                description="Post excerpt/summary.",
+                required=False,
+            ),
+            ToolParameter(
+                name="privacy_level", type="string",
+                description="Privacy level: 'public' (default), 'semi-private' (images hidden behind password), 'full-private' (all content hidden behind password).",
+                required=False,
+                enum=["public", "semi-private", "full-private"],
+            ),
+            ToolParameter(
+                name="post_password", type="string",
+                description="Password for semi-private or full-private posts. Leave blank to use the site default password.",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="wordpress_posts_create",
-            description="Create a new WordPress post. Categories and tags accept comma-separated names (will be created if they don't exist).",
-            parameters=[
-                ToolParameter(name="title", type="string", description="Post title"),
-                ToolParameter(name="content", type="string", description="Post content (HTML supported)"),
-                ToolParameter(
-                    name="status", type="string",
-                    description="Post status (default 'draft').",
-                    required=False,
-                    enum=["publish", "draft", "pending", "private"],
-                ),
-                ToolParameter(
-                    name="categories", type="string",
-                    description="Comma-separated category names.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="tags", type="string",
-                    description="Comma-separated tag names.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="excerpt", type="string",
-                    description="Post excerpt/summary.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="privacy_level", type="string",
-                    description="Privacy level: 'public' (default), 'semi-private' (images hidden behind password), 'full-private' (all content hidden behind password).",
-                    required=False,
-                    enum=["public", "semi-private", "full-private"],
-                ),
-                ToolParameter(
-                    name="post_password", type="string",
-                    description="Password for semi-private or full-private posts. Leave blank to use the site default password.",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         if not _wp.is_configured:
             return "WordPress not configured."
         try:
-            cat_ids = None
-            tag_ids = None
-            if kwargs.get("categories"):
-                names = [n.strip() for n in kwargs["categories"].split(",")]
-                cat_ids = await _wp.get_or_create_categories(names)
-            if kwargs.get("tags"):
-                names = [n.strip() for n in kwargs["tags"].split(",")]
-                tag_ids = await _wp.get_or_create_tags(names)
+            cat_ids, tag_ids = await _resolve_terms(kwargs)
 
             post = await _wp.create_post(
                 title=kwargs["title"],
@@ -170,53 +199,48 @@ class WordPressCreatePostTool(BaseTool):
 
 
 class WordPressUpdatePostTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="wordpress_posts_update",
+        description="Update an existing WordPress post. Only provided fields are changed.",
+        parameters=[
+            ToolParameter(name="post_id", type="integer", description="The post ID to update"),
+            ToolParameter(name="title", type="string", description="New title", required=False),
+            ToolParameter(name="content", type="string", description="New content", required=False),
+            ToolParameter(
+                name="status", type="string",
+                description="New status.",
+                required=False,
+                enum=["publish", "draft", "pending", "private"],
+            ),
+            ToolParameter(
+                name="categories", type="string",
+                description="Comma-separated category names.",
+                required=False,
+            ),
+            ToolParameter(
+                name="tags", type="string",
+                description="Comma-separated tag names.",
+                required=False,
+            ),
+            ToolParameter(name="excerpt", type="string", description="New excerpt", required=False),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="wordpress_posts_update",
-            description="Update an existing WordPress post. Only provided fields are changed.",
-            parameters=[
-                ToolParameter(name="post_id", type="integer", description="The post ID to update"),
-                ToolParameter(name="title", type="string", description="New title", required=False),
-                ToolParameter(name="content", type="string", description="New content", required=False),
-                ToolParameter(
-                    name="status", type="string",
-                    description="New status.",
-                    required=False,
-                    enum=["publish", "draft", "pending", "private"],
-                ),
-                ToolParameter(
-                    name="categories", type="string",
-                    description="Comma-separated category names.",
-                    required=False,
-                ),
-                ToolParameter(
-                    name="tags", type="string",
-                    description="Comma-separated tag names.",
-                    required=False,
-                ),
-                ToolParameter(name="excerpt", type="string", description="New excerpt", required=False),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         if not _wp.is_configured:
             return "WordPress not configured."
         try:
-            fields: dict[str, Any] = {}
-            if kwargs.get("title"):
-                fields["title"] = kwargs["title"]
-            if kwargs.get("content"):
-                fields["content"] = kwargs["content"]
-            if kwargs.get("status"):
-                fields["status"] = kwargs["status"]
-            if kwargs.get("excerpt"):
-                fields["excerpt"] = kwargs["excerpt"]
-            if kwargs.get("categories"):
-                names = [n.strip() for n in kwargs["categories"].split(",")]
-                fields["categories"] = await _wp.get_or_create_categories(names)
-            if kwargs.get("tags"):
-                names = [n.strip() for n in kwargs["tags"].split(",")]
-                fields["tags"] = await _wp.get_or_create_tags(names)
+            fields: dict[str, Any] = {
+                key: value for key in _UPDATE_FIELDS if (value := kwargs.get(key))
+            }
+            cat_ids, tag_ids = await _resolve_terms(kwargs)
+            if cat_ids is not None:
+                fields["categories"] = cat_ids
+            if tag_ids is not None:
+                fields["tags"] = tag_ids
 
             if not fields:
                 return "No fields to update."
@@ -231,14 +255,16 @@ class WordPressUpdatePostTool(BaseTool):
 
 
 class WordPressDeletePostTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="wordpress_posts_delete",
+        description="Delete a WordPress post by ID (moves to trash).",
+        parameters=[
+            ToolParameter(name="post_id", type="integer", description="The post ID to delete"),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="wordpress_posts_delete",
-            description="Delete a WordPress post by ID (moves to trash).",
-            parameters=[
-                ToolParameter(name="post_id", type="integer", description="The post ID to delete"),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         if not _wp.is_configured:
@@ -251,37 +277,39 @@ class WordPressDeletePostTool(BaseTool):
 
 
 class WordPressUploadMediaTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="wordpress_media_upload",
+        description="Upload an image from the data directory to WordPress. Automatically converts to WebP and resizes to under 100KB.",
+        parameters=[
+            ToolParameter(
+                name="file_path", type="string",
+                description="Path to the image file relative to the data directory (e.g. 'photos/pic.jpg').",
+            ),
+            ToolParameter(
+                name="alt_text", type="string",
+                description="Alt text for the image.",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="wordpress_media_upload",
-            description="Upload an image from the data directory to WordPress. Automatically converts to WebP and resizes to under 100KB.",
-            parameters=[
-                ToolParameter(
-                    name="file_path", type="string",
-                    description="Path to the image file relative to the data directory (e.g. 'photos/pic.jpg').",
-                ),
-                ToolParameter(
-                    name="alt_text", type="string",
-                    description="Alt text for the image.",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         if not _wp.is_configured:
             return "WordPress not configured."
         try:
-            file_path = settings.data_dir / kwargs["file_path"]
-            # Ensure sandboxed
-            resolved = file_path.resolve()
-            if not str(resolved).startswith(str(settings.data_dir.resolve())):
+            try:
+                resolved = resolve_sandboxed_path(kwargs["file_path"])
+            except SandboxError:
                 return "Error: file path must be within the data directory."
             if not resolved.exists():
                 return f"Error: file not found: {kwargs['file_path']}"
 
-            raw_data = resolved.read_bytes()
-            webp_data, filename = _wp._process_image(raw_data)
+            # Disk read and image encode both block, so keep them off the loop
+            raw_data = await asyncio.to_thread(resolved.read_bytes)
+            webp_data, filename = await asyncio.to_thread(_wp._process_image, raw_data)
 
             media = await _wp.upload_media(
                 filename=filename,
@@ -300,18 +328,20 @@ class WordPressUploadMediaTool(BaseTool):
 
 
 class WordPressListTagsTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="wordpress_tags_list",
+        description="List WordPress tags, optionally filtering by search term.",
+        parameters=[
+            ToolParameter(
+                name="search", type="string",
+                description="Search term to filter tags.",
+                required=False,
+            ),
+        ],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="wordpress_tags_list",
-            description="List WordPress tags, optionally filtering by search term.",
-            parameters=[
-                ToolParameter(
-                    name="search", type="string",
-                    description="Search term to filter tags.",
-                    required=False,
-                ),
-            ],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         if not _wp.is_configured:
@@ -324,17 +354,18 @@ class WordPressListTagsTool(BaseTool):
         if not tags:
             return "No tags found."
 
-        lines = [f"- {t['name']} (ID: {t['id']}, count: {t.get('count', 0)})" for t in tags]
-        return "WordPress tags:\n" + "\n".join(lines)
+        return "WordPress tags:\n" + "\n".join(map(_format_term_line, tags))
 
 
 class WordPressListCategoriesTool(BaseTool):
+    _DEF = ToolDefinition(
+        name="wordpress_categories_list",
+        description="List all WordPress categories.",
+        parameters=[],
+    )
+
     def definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="wordpress_categories_list",
-            description="List all WordPress categories.",
-            parameters=[],
-        )
+        return self._DEF
 
     async def execute(self, **kwargs: Any) -> str:
         if not _wp.is_configured:
@@ -347,5 +378,4 @@ class WordPressListCategoriesTool(BaseTool):
         if not cats:
             return "No categories found."
 
-        lines = [f"- {c['name']} (ID: {c['id']}, count: {c.get('count', 0)})" for c in cats]
-        return "WordPress categories:\n" + "\n".join(lines)
+        return "WordPress categories:\n" + "\n".join(map(_format_term_line, cats))
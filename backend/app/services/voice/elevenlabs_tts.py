@@ -1,6 +1,7 @@
 """ElevenLabs TTS provider."""
 
 import httpx
+import orjson
 
 from app.core.config import settings
 from app.services.voice.base import BaseTTSProvider
@@ -11,33 +12,52 @@ class ElevenLabsTTSProvider(BaseTTSProvider):
 
     BASE_URL = "https://api.elevenlabs.io/v1"
 
+    # Shared across providers so back-to-back utterances reuse one connection
+    _client: httpx.AsyncClient | None = None
+
     def __init__(self, voice_id: str = "21m00Tcm4TlvDq8ikWAM"):
         # Default voice is "Rachel"
         self._voice_id = voice_id
 
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None:
+            cls._client = httpx.AsyncClient(
+                base_url=cls.BASE_URL,
+                timeout=30.0,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
+        return cls._client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client (called on app shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
     async def synthesize(self, text: str) -> bytes:
         if not settings.elevenlabs_api_key:
             raise RuntimeError("ElevenLabs API key not configured")
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.BASE_URL}/text-to-speech/{self._voice_id}",
-                headers={
-                    "xi-api-key": settings.elevenlabs_api_key,
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "text": text,
-                    "model_id": "eleven_multilingual_v2",
-                    "voice_settings": {
-                        "stability": 0.5,
-                        "similarity_boost": 0.75,
-                    },
+        resp = await self._get_client().post(
+            f"/text-to-speech/{self._voice_id}",
+            headers={
+                "xi-api-key": settings.elevenlabs_api_key,
+                "Content-Type": "application/json",
+            },
+            content=orjson.dumps({
+                "text": text,
+                "model_id": "eleven_multilingual_v2",
+                "voice_settings": {
+                    "stability": 0.5,
+                    "similarity_boost": 0.75,
                 },
-                timeout=30.0,
-            )
-            resp.raise_for_status()
-            return resp.content
+            }),
+        )
+        resp.raise_for_status()
+        return resp.content
 
     def audio_mime_type(self) -> str:
         return "audio/mpeg"
@@ -1,49 +1,70 @@
 """Local Whisper STT provider using the openai-whisper library or faster-whisper."""
 
 import asyncio
+import io
 import logging
-import tempfile
-from pathlib import Path
+import threading
+from typing import Any
 
+from app.core.config import settings
 from app.services.voice.base import BaseSTTProvider
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL_SIZE = "base"
 
-class WhisperSTTProvider(BaseSTTProvider):
-    """Local Whisper speech-to-text using faster-whisper."""
+# Loaded models by size, shared by every provider instance; loading takes
+# seconds, so it happens once per process (ideally during startup).
+_models: dict[str, Any] = {}
+_models_lock = threading.Lock()
 
-    def __init__(self, model_size: str = "base"):
-        self._model_size = model_size
-        self._model = None
 
-    def _ensure_model(self):
-        if self._model is None:
+def _load_model(model_size: str) -> Any:
+    with _models_lock:
+        model = _models.get(model_size)
+        if model is None:
             try:
                 from faster_whisper import WhisperModel
-                self._model = WhisperModel(self._model_size, device="auto", compute_type="auto")
-                logger.info(f"Loaded Whisper model: {self._model_size}")
             except ImportError:
                 raise RuntimeError(
                     "faster-whisper is not installed. Run: uv add faster-whisper"
                 )
+            model = _models[model_size] = WhisperModel(
+                model_size, device="auto", compute_type=settings.whisper_compute_type
+            )
+            logger.info(f"Loaded Whisper model: {model_size}")
+        return model
+
+
+async def warm_up(model_size: str = DEFAULT_MODEL_SIZE) -> None:
+    """Load the Whisper model in a worker thread ahead of the first request."""
+    try:
+        await asyncio.to_thread(_load_model, model_size)
+    except RuntimeError as e:
+        logger.info(f"Speech-to-text unavailable: {e}")
+    except Exception as e:  # e.g. a failed model download; retried on first use
+        logger.warning(f"Could not preload the Whisper model: {e}")
+
+
+class WhisperSTTProvider(BaseSTTProvider):
+    """Local Whisper speech-to-text using faster-whisper."""
+
+    def __init__(self, model_size: str = DEFAULT_MODEL_SIZE):
+        self._model_size = model_size
 
     async def transcribe(self, audio_data: bytes, mime_type: str = "audio/webm") -> str:
-        self._ensure_model()
-
-        # Write audio to temp file (whisper needs a file path)
-        suffix = ".webm" if "webm" in mime_type else ".wav"
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
-            f.write(audio_data)
-            temp_path = f.name
-
-        try:
-            segments, _ = await asyncio.to_thread(
-                self._model.transcribe,  # type: ignore
-                temp_path,
-                language="en",
-            )
-            text = " ".join(segment.text for segment in segments)
-            return text.strip()
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        # Already loaded at startup unless the warm-up is still running
+        model = _models.get(self._model_size)
+        if model is None:
+            model = await asyncio.to_thread(_load_model, self._model_size)
+
+        return await asyncio.to_thread(_transcribe, model, audio_data)
+
+
+def _transcribe(model: Any, audio_data: bytes) -> str:
+    # faster-whisper decodes from a file-like object (the container format
+    # is probed, so the MIME type isn't needed). Segments are produced
+    # lazily, so iterating them here is what runs the model.
+    segments, _ = model.transcribe(io.BytesIO(audio_data), language="en")
+    parts = [text for segment in segments if (text := segment.text.strip())]
+    return " ".join(parts)
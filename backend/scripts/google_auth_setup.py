@@ -9,9 +9,9 @@ Usage:
     uv run python scripts/google_auth_setup.py
 """
 
-import json
 from pathlib import Path
 
+import orjson
 from google_auth_oauthlib.flow import InstalledAppFlow
 
 SCOPES = [
@@ -39,9 +39,9 @@ creds = flow.run_local_server(port=0)
 # Save credentials
 output_path = BACKEND_DIR / "data" / "google-credentials.json"
 output_path.parent.mkdir(parents=True, exist_ok=True)
-creds_data = json.loads(creds.to_json())
+creds_data = orjson.loads(creds.to_json())
 creds_data["type"] = "authorized_user"
-output_path.write_text(json.dumps(creds_data, indent=2))
+output_path.write_bytes(orjson.dumps(creds_data, option=orjson.OPT_INDENT_2))
 
 print(f"\nCredentials saved to: {output_path}")
 print(f"\nUpdate your .env file:")
@@ -1,5 +1,6 @@
 """Shared test fixtures for backend tests."""
 
+import importlib.util
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -16,22 +17,41 @@ test_engine = create_engine(
     poolclass=StaticPool,
 )
 
+# Run the app on uvloop like uvicorn[standard] does, where it is installed
+_BACKEND_OPTIONS = {"use_uvloop": importlib.util.find_spec("uvloop") is not None}
+
 
 def get_test_session():
     with Session(test_engine) as session:
         yield session
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def setup_test_db():
-    """Create all tables before each test, drop after."""
+    """Create all tables once for the whole run, drop at the end."""
     import app.models  # noqa: F401 - register models
     SQLModel.metadata.create_all(test_engine)
     yield
     SQLModel.metadata.drop_all(test_engine)
 
 
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """Empty every table after each test instead of rebuilding the schema."""
+    yield
+    with test_engine.begin() as conn:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
 @pytest.fixture
+def db():
+    """Session on the test DB for checking what the app wrote."""
+    with Session(test_engine) as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
 def mock_agent():
     """Mock Agent that yields fake tokens."""
     async def fake_run(messages):
@@ -48,21 +68,28 @@ async def noop_scheduler():
     return
 
 
-@pytest.fixture
+async def noop_warm_up(*args, **kwargs):
+    """No-op replacement for the startup warm-ups (Whisper model, Google credentials)."""
+    return
+
+
+@pytest.fixture(scope="session")
 def client(mock_agent):
-    """FastAPI TestClient with all external deps patched."""
+    """FastAPI TestClient with all external deps patched, started once per run."""
     with (
         patch("app.core.database.engine", test_engine),
         patch("app.api.chat.engine", test_engine),
         patch("app.api.chat.Agent", return_value=mock_agent),
         patch("app.services.scheduler.scheduler.scheduler_loop", noop_scheduler),
+        patch("app.services.voice.whisper_stt.warm_up", noop_warm_up),
+        patch("app.services.integrations.google.GoogleService.warm_up", noop_warm_up),
     ):
         from app.main import app
 
         # Use FastAPI's dependency override for get_session
         app.dependency_overrides[get_session] = get_test_session
 
-        with TestClient(app) as c:
+        with TestClient(app, backend_options=_BACKEND_OPTIONS) as c:
             yield c
 
         app.dependency_overrides.clear()
@@ -15,12 +15,12 @@ def _seed_conversation(title="Test Chat", messages=None):
         session.refresh(conv)
 
         if messages:
-            for role, content in messages:
-                msg = ChatMessage(conversation_id=conv.id, role=role, content=content)
-                session.add(msg)
+            session.add_all(
+                ChatMessage(conversation_id=conv.id, role=role, content=content)
+                for role, content in messages
+            )
             session.commit()
 
-        session.refresh(conv)
         return conv.id
 
 
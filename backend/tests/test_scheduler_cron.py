@@ -0,0 +1,69 @@
+"""Tests for the scheduler's cron expression parsing."""
+
+from datetime import datetime
+
+import pytest
+
+from app.services.scheduler.scheduler import _cron_matches_now, _parse_cron, _parse_cron_field
+
+
+@pytest.mark.parametrize(
+    "pattern,low,high,expected",
+    [
+        ("*", 0, 59, None),
+        ("5", 0, 59, {5}),
+        ("1,3,5", 0, 59, {1, 3, 5}),
+        ("10-13", 0, 59, {10, 11, 12, 13}),
+        ("*/15", 0, 59, {0, 15, 30, 45}),
+        ("10-30/10", 0, 59, {10, 20, 30}),
+        ("5/15", 0, 59, {5, 20, 35, 50}),
+        ("1-2,20", 1, 31, {1, 2, 20}),
+    ],
+)
+def test_parse_cron_field(pattern, low, high, expected):
+    result = _parse_cron_field(pattern, low, high)
+    assert result == (None if expected is None else frozenset(expected))
+
+
+@pytest.mark.parametrize(
+    "pattern,low,high",
+    [
+        ("*/0", 0, 59),
+        ("60", 0, 59),
+        ("0", 1, 31),
+        ("5-60", 0, 59),
+        ("30-10", 0, 59),
+        ("abc", 0, 59),
+    ],
+)
+def test_parse_cron_field_rejects_invalid(pattern, low, high):
+    with pytest.raises(ValueError):
+        _parse_cron_field(pattern, low, high)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    ["", "* * * *", "* * * * * *", "*/0 * * * *", "61 * * * *", "* 24 * * *", "* * * 13 *"],
+)
+def test_parse_cron_invalid_returns_none(expr):
+    assert _parse_cron(expr) is None
+
+
+def test_parse_cron_maps_dow_7_to_sunday():
+    assert _parse_cron("0 9 * * 7")[4] == frozenset({0})
+    assert _parse_cron("0 9 * * 5-7")[4] == frozenset({0, 5, 6})
+
+
+@pytest.mark.parametrize(
+    "expr,now,expected",
+    [
+        ("30 9 * * *", datetime(2025, 6, 2, 9, 30), True),
+        ("30 9 * * *", datetime(2025, 6, 2, 9, 31), False),
+        ("*/15 * * * *", datetime(2025, 6, 2, 14, 45), True),
+        ("0 9 * * 7", datetime(2025, 6, 1, 9, 0), True),  # a Sunday
+        ("0 9 * * 1-5", datetime(2025, 6, 1, 9, 0), False),
+        ("not a cron", datetime(2025, 6, 2, 9, 30), False),
+    ],
+)
+def test_cron_matches_now(expr, now, expected):
+    assert _cron_matches_now(expr, now) is expected
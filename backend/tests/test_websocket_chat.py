@@ -1,12 +1,45 @@
 """Tests for the WebSocket chat endpoint."""
 
-import json
+import orjson
+import pytest
+from sqlalchemy import bindparam
+from sqlmodel import func, select
 
-from sqlmodel import Session, select
-
-from tests.conftest import test_engine
 from app.models.conversation import ChatMessage, Conversation
 
+_END_PREFIX = '{"type":"end"'
+_JSON_MESSAGE = orjson.dumps({"content": "test message"}).decode()
+
+# Built once at import and bound per call with the conversation id
+_MESSAGE_ROWS = (
+    select(ChatMessage.role, ChatMessage.content)
+    .where(ChatMessage.conversation_id == bindparam("cid"))
+    .order_by(ChatMessage.created_at)
+)
+_MESSAGE_COUNT = (
+    select(func.count())
+    .select_from(ChatMessage)
+    .where(ChatMessage.conversation_id == bindparam("cid"))
+)
+
+
+def _drain_until_end(ws, tokens=None):
+    """Read frames until the end marker and return it, collecting tokens if given."""
+    while True:
+        data = ws.receive_text()
+        if data.startswith(_END_PREFIX):
+            return orjson.loads(data)
+        if tokens is not None:
+            tokens.append(data)
+
+
+def _json_message(content, conv_id):
+    return orjson.dumps({"content": content, "conversation_id": conv_id}).decode()
+
+
+def _count_messages(db, conv_id):
+    return db.exec(_MESSAGE_COUNT, params={"cid": conv_id}).one()
+
 
 def test_websocket_connect_disconnect(client):
     """Basic connection and clean disconnect."""
@@ -14,173 +47,80 @@ def test_websocket_connect_disconnect(client):
         pass  # just connect and disconnect
 
 
-def test_websocket_send_receive_tokens(client):
-    """Send a message, receive streamed tokens and end marker."""
+@pytest.mark.parametrize(
+    "payload", ["hello", orjson.dumps({"content": "hello"}).decode()], ids=["text", "json"]
+)
+def test_websocket_send_receive_tokens(client, payload):
+    """Send a message, receive streamed tokens and an end marker with the conversation_id."""
     with client.websocket_connect("/api/chat/ws") as ws:
-        ws.send_text("hello")
+        ws.send_text(payload)
 
         # Collect streamed tokens
         tokens = []
-        while True:
-            data = ws.receive_text()
-            try:
-                parsed = json.loads(data)
-                if parsed.get("type") == "end":
-                    break
-            except json.JSONDecodeError:
-                tokens.append(data)
+        end_data = _drain_until_end(ws, tokens)
 
         assert "".join(tokens) == "Hello from agent"
-
-
-def test_websocket_end_marker_has_conversation_id(client):
-    """End marker should include the conversation_id."""
-    with client.websocket_connect("/api/chat/ws") as ws:
-        ws.send_text("hi")
-
-        end_data = None
-        while True:
-            data = ws.receive_text()
-            try:
-                parsed = json.loads(data)
-                if parsed.get("type") == "end":
-                    end_data = parsed
-                    break
-            except json.JSONDecodeError:
-                continue
-
-        assert end_data is not None
-        assert "conversation_id" in end_data
         assert isinstance(end_data["conversation_id"], int)
 
 
 def test_websocket_json_payload_with_conversation_id(client):
     """Client can send JSON with content and conversation_id."""
     with client.websocket_connect("/api/chat/ws") as ws:
-        ws.send_text(json.dumps({"content": "test message"}))
+        ws.send_text(_JSON_MESSAGE)
 
         # Drain tokens until end marker
-        end_data = None
-        while True:
-            data = ws.receive_text()
-            try:
-                parsed = json.loads(data)
-                if parsed.get("type") == "end":
-                    end_data = parsed
-                    break
-            except json.JSONDecodeError:
-                continue
-
-        conv_id = end_data["conversation_id"]
+        conv_id = _drain_until_end(ws)["conversation_id"]
 
         # Send second message to same conversation
-        ws.send_text(json.dumps({"content": "follow up", "conversation_id": conv_id}))
-        end_data2 = None
-        while True:
-            data = ws.receive_text()
-            try:
-                parsed = json.loads(data)
-                if parsed.get("type") == "end":
-                    end_data2 = parsed
-                    break
-            except json.JSONDecodeError:
-                continue
-
-        assert end_data2["conversation_id"] == conv_id
-
-
-def test_websocket_messages_persisted(client):
+        ws.send_text(_json_message("follow up", conv_id))
+        assert _drain_until_end(ws)["conversation_id"] == conv_id
+
+
+def test_websocket_messages_persisted(client, db):
     """User and assistant messages should be saved to the database."""
     with client.websocket_connect("/api/chat/ws") as ws:
         ws.send_text("save me")
 
         # Drain until end
-        while True:
-            data = ws.receive_text()
-            try:
-                parsed = json.loads(data)
-                if parsed.get("type") == "end":
-                    conv_id = parsed["conversation_id"]
-                    break
-            except json.JSONDecodeError:
-                continue
+        conv_id = _drain_until_end(ws)["conversation_id"]
 
     # Check DB
-    with Session(test_engine) as session:
-        conv = session.get(Conversation, conv_id)
-        assert conv is not None
+    assert db.get(Conversation, conv_id) is not None
 
-        messages = session.exec(
-            select(ChatMessage)
-            .where(ChatMessage.conversation_id == conv_id)
-            .order_by(ChatMessage.created_at)
-        ).all()
+    messages = db.exec(_MESSAGE_ROWS, params={"cid": conv_id}).all()
 
-        assert len(messages) == 2
-        assert messages[0].role == "user"
-        assert messages[0].content == "save me"
-        assert messages[1].role == "assistant"
-        assert messages[1].content == "Hello from agent"
+    assert messages == [
+        ("user", "save me"),
+        ("assistant", "Hello from agent"),
+    ]
 
 
-def test_websocket_multiple_messages_same_conversation(client):
+def test_websocket_multiple_messages_same_conversation(client, db):
     """Multiple messages in one session reuse the same conversation."""
     with client.websocket_connect("/api/chat/ws") as ws:
-        conv_ids = []
-        for msg in ["first", "second", "third"]:
+        ws.send_text("first")
+        conv_id = _drain_until_end(ws)["conversation_id"]
+
+        # Later messages should land in the same conversation
+        for msg in ("second", "third"):
             ws.send_text(msg)
-            while True:
-                data = ws.receive_text()
-                try:
-                    parsed = json.loads(data)
-                    if parsed.get("type") == "end":
-                        conv_ids.append(parsed["conversation_id"])
-                        break
-                except json.JSONDecodeError:
-                    continue
-
-        # All messages should be in the same conversation
-        assert len(set(conv_ids)) == 1
+            assert _drain_until_end(ws)["conversation_id"] == conv_id
 
     # Should have 6 messages total (3 user + 3 assistant)
-    with Session(test_engine) as session:
-        messages = session.exec(
-            select(ChatMessage).where(ChatMessage.conversation_id == conv_ids[0])
-        ).all()
-        assert len(messages) == 6
+    assert _count_messages(db, conv_id) == 6
 
 
-def test_websocket_load_existing_conversation(client):
+def test_websocket_load_existing_conversation(client, db):
     """Sending a conversation_id should load existing history."""
     # Create a conversation with messages via first WS session
     with client.websocket_connect("/api/chat/ws") as ws:
         ws.send_text("initial message")
-        while True:
-            data = ws.receive_text()
-            try:
-                parsed = json.loads(data)
-                if parsed.get("type") == "end":
-                    conv_id = parsed["conversation_id"]
-                    break
-            except json.JSONDecodeError:
-                continue
+        conv_id = _drain_until_end(ws)["conversation_id"]
 
     # Connect again referencing the same conversation
     with client.websocket_connect("/api/chat/ws") as ws:
-        ws.send_text(json.dumps({"content": "continuing", "conversation_id": conv_id}))
-        while True:
-            data = ws.receive_text()
-            try:
-                parsed = json.loads(data)
-                if parsed.get("type") == "end":
-                    assert parsed["conversation_id"] == conv_id
-                    break
-            except json.JSONDecodeError:
-                continue
+        ws.send_text(_json_message("continuing", conv_id))
+        assert _drain_until_end(ws)["conversation_id"] == conv_id
 
     # Should have 4 messages total
-    with Session(test_engine) as session:
-        messages = session.exec(
-            select(ChatMessage).where(ChatMessage.conversation_id == conv_id)
-        ).all()
-        assert len(messages) == 4
+    assert _count_messages(db, conv_id) == 4